@@ -0,0 +1,84 @@
+# api/admin_endpoints.py
+
+import hmac
+
+from fastapi import APIRouter, Header
+from fastapi.responses import PlainTextResponse
+
+from core.responses import JSONResponse
+from core.config import ADMIN_TOKEN
+from core.models import ProfilerStartRequest
+from core.profiler import PROFILER
+from core.prompts import PROMPTS
+
+router = APIRouter(default_response_class=JSONResponse)
+
+
+def check_admin(token: str | None) -> JSONResponse | None:
+    """Trả về response lỗi nếu token admin không hợp lệ, None nếu hợp lệ."""
+
+    if ADMIN_TOKEN is None:
+        # Không cấu hình ADMIN_TOKEN thì coi như không có admin endpoint
+        return JSONResponse(status_code=404, content={"error": "Not found"})
+    if not token or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        return JSONResponse(status_code=403, content={"error": "Invalid admin token"})
+    return None
+
+
+@router.get("/admin/profiler")
+async def profiler_status(x_admin_token: str | None = Header(None)):
+    if (denied := check_admin(x_admin_token)) is not None:
+        return denied
+    return PROFILER.status()
+
+
+@router.post("/admin/profiler/start")
+async def profiler_start(data: ProfilerStartRequest, x_admin_token: str | None = Header(None)):
+    """
+    Bật profiler. Các trường bỏ trống giữ giá trị từ PROFILER_* env vars.
+    """
+    if (denied := check_admin(x_admin_token)) is not None:
+        return denied
+    PROFILER.start(
+        routes=data.routes,
+        sample_rate=data.sample_rate,
+        interval_ms=data.interval_ms,
+        block_threshold_ms=data.block_threshold_ms,
+        reset=data.reset,
+    )
+    return PROFILER.status()
+
+
+@router.post("/admin/profiler/stop")
+async def profiler_stop(x_admin_token: str | None = Header(None)):
+    if (denied := check_admin(x_admin_token)) is not None:
+        return denied
+    PROFILER.stop()
+    return PROFILER.status()
+
+
+@router.get("/admin/profiler/flamegraph")
+async def profiler_flamegraph(x_admin_token: str | None = Header(None)):
+    """
+    Collapsed stacks (`flamegraph.pl`, speedscope, inferno đều đọc được).
+    """
+    if (denied := check_admin(x_admin_token)) is not None:
+        return denied
+    return PlainTextResponse(PROFILER.collapsed())
+
+
+@router.get("/admin/profiler/blocking")
+async def profiler_blocking(x_admin_token: str | None = Header(None)):
+    if (denied := check_admin(x_admin_token)) is not None:
+        return denied
+    return {"incidents": PROFILER.blocking_incidents()}
+
+
+@router.get("/admin/prompts")
+async def prompt_stats(x_admin_token: str | None = Header(None)):
+    """
+    Token và latency theo từng prompt template (core/prompts.py).
+    """
+    if (denied := check_admin(x_admin_token)) is not None:
+        return denied
+    return {"templates": PROMPTS.stats()}
@@ -0,0 +1,92 @@
+# api/interview_endpoints.py
+
+from fastapi import APIRouter
+import base64
+import re
+
+from core.responses import JSONResponse
+from core.models import InterviewSessionRequest
+from core.interview_sessions import INTERVIEW_SESSIONS, SessionNotFound
+from core.log import get_logger
+
+router = APIRouter(default_response_class=JSONResponse)
+logger = get_logger(__name__)
+
+MAX_SESSION_QUESTIONS = 50
+# Google TTS rejects inputs above 5000 bytes
+MAX_QUESTION_BYTES = 5000
+
+SESSION_NOT_FOUND = {"error": "Phiên phỏng vấn không tồn tại hoặc đã hết hạn."}
+
+def strip_category(question: str) -> str:
+    """Drop the leading [Background]/[Situation]/[Technical] tag; it is not read aloud."""
+    return re.sub(r'^\s*\[[^\]]*\]\s*', '', question).strip()
+
+@router.post("/interview/sessions")
+async def create_interview_session(data: InterviewSessionRequest):
+    """
+    Tạo phiên phỏng vấn từ danh sách câu hỏi và bắt đầu tổng hợp giọng nói
+    cho các câu đầu tiên ở background.
+    """
+    # Giữ đúng thứ tự và số lượng: index của client phải trỏ đúng câu hỏi
+    questions = [strip_category(q) for q in data.questions]
+    if not questions:
+        return JSONResponse(status_code=400, content={"error": "Danh sách câu hỏi trống."})
+    empty = [i for i, q in enumerate(questions) if not q]
+    if empty:
+        return JSONResponse(status_code=400, content={"error": f"Câu hỏi số {empty[0] + 1} trống."})
+    if len(questions) > MAX_SESSION_QUESTIONS:
+        return JSONResponse(status_code=400, content={"error": f"Tối đa {MAX_SESSION_QUESTIONS} câu hỏi mỗi phiên."})
+    if any(len(q.encode("utf-8")) > MAX_QUESTION_BYTES for q in questions):
+        return JSONResponse(status_code=400, content={"error": "Câu hỏi quá dài để đọc."})
+
+    session = INTERVIEW_SESSIONS.create(questions, data.language)
+    logger.info("interview_session_created", extra={
+        "questions": len(questions), "language": data.language,
+    })
+    return JSONResponse(content=session.status())
+
+@router.get("/interview/sessions/{session_id}")
+async def get_interview_session(session_id: str):
+    try:
+        return INTERVIEW_SESSIONS.get(session_id).status()
+    except SessionNotFound:
+        return JSONResponse(status_code=404, content=SESSION_NOT_FOUND)
+
+@router.get("/interview/sessions/{session_id}/questions/{index}/audio")
+async def interview_question_audio(session_id: str, index: int):
+    """
+    Audio (base64 mp3, như /text-to-speech) của câu hỏi thứ ``index``.
+    Đồng thời prefetch các câu tiếp theo.
+    """
+    try:
+        session = INTERVIEW_SESSIONS.get(session_id)
+        if not 0 <= index < len(session.questions):
+            return JSONResponse(status_code=404, content={"error": "Không có câu hỏi này trong phiên."})
+
+        audio, cached = await INTERVIEW_SESSIONS.audio(session, index)
+        return JSONResponse(content={
+            "audio": base64.b64encode(audio).decode('utf-8'),
+            "format": "mp3",
+            "index": index,
+            "question": session.questions[index],
+            "cached": cached,
+        })
+    except SessionNotFound:
+        return JSONResponse(status_code=404, content=SESSION_NOT_FOUND)
+    except Exception as e:
+        logger.error("interview_audio_failed", extra={"index": index, "error": str(e)})
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Failed to synthesize speech: {str(e)}"}
+        )
+
+@router.delete("/interview/sessions/{session_id}")
+async def close_interview_session(session_id: str):
+    if not INTERVIEW_SESSIONS.close(session_id):
+        return JSONResponse(status_code=404, content=SESSION_NOT_FOUND)
+    return {"closed": True}
+
+@router.get("/interview/stats")
+async def interview_stats():
+    return INTERVIEW_SESSIONS.stats()
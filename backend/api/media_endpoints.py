@@ -1,94 +1,70 @@
 # api/media_endpoints.py
 
 from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse
 from fastapi.concurrency import run_in_threadpool
-from google.cloud import speech, vision, texttospeech
+from google.cloud import speech
 import base64
-import os
 # Import từ file config/models mới
+from core.responses import JSONResponse
 from core.models import TextToSpeechRequest
-from core.config import GOOGLE_SPEECH_KEY_FILE, VISION_KEY, get_credential_path
+from core.config import (
+    GOOGLE_SPEECH_KEY_FILE,
+    MAX_AUDIO_UPLOAD_BYTES,
+    MAX_CV_UPLOAD_BYTES,
+    VISION_KEY,
+)
+from core.extraction import EXTRACTION_MODE, extract_cv_text
+from core.ocr import OcrResult
+from core.ocr_cache import OCR_CACHE, cache_key
+from core.providers import get_speech_client
+from core.tts import synthesize_speech
+from core.uploads import IngestedUpload, UploadTooLarge, ingest_upload
+from core.log import get_logger
+from core.metrics import track_external_call
 
-router = APIRouter()
+router = APIRouter(default_response_class=JSONResponse)
+logger = get_logger(__name__)
 
 # --- Chuyển các hàm OCR, STT, TTS (bao gồm logic bên trong) sang đây ---
 
-def ocr_cv_file_sync(content: bytes, mime_type: str) -> str:
+async def extract_cv_file(content: bytes | memoryview, mime_type: str) -> tuple[str, OcrResult | None]:
     """
-    Uses Google Cloud Vision (Synchronous) to OCR files (PDF/Images)
-    by selecting the correct API method based on MIME_TYPE.
+    Extracts CV text from DOCX/PDF/images. DOCX and text-layer PDF pages are
+    parsed locally; only images and scanned PDF pages go to Google Vision.
+    Returns the text (or an error string) and the per-page result.
     """
     try:
-        ocr_key_path = get_credential_path("ocr_key.json")
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = ocr_key_path
-        client = vision.ImageAnnotatorClient()
- 
-        print(f"Processing file ({mime_type}) with Google Vision (Sync)...")
- 
-        # Handle Documents (PDF, TIFF, DOCX)
-        if mime_type in ["application/pdf", "image/tiff", "image/gif", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]:
-            print("Using PDF/TIFF/DOCX logic...")
-            # Treat DOCX as PDF for Vision API input config
-            actual_mime = "application/pdf" if "wordprocessingml" in mime_type else mime_type
- 
-            input_config = vision.InputConfig(content=content, mime_type=actual_mime)
-            features = [vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)]
-            file_request = vision.AnnotateFileRequest(input_config=input_config, features=features)
-            batch_request = vision.BatchAnnotateFilesRequest(requests=[file_request])
- 
-            response = client.batch_annotate_files(request=batch_request)
- 
-            file_response = response.responses[0]
-            page_response = file_response.responses[0] # Get the first page
- 
-            if page_response.error.message:
-                raise Exception(f"Vision API Error (PDF/DOCX): {page_response.error.message}")
- 
-            if page_response.full_text_annotation:
-                return page_response.full_text_annotation.text
-            else:
-                return "No text found in file."
- 
-        # Handle Images (PNG, JPG)
-        elif mime_type in ["image/png", "image/jpeg"]:
-            print("Using Image logic (PNG/JPG)...")
-            image = vision.Image(content=content)
- 
-            response = client.document_text_detection(image=image)
- 
-            if response.error.message:
-                raise Exception(f"Vision API Error (Image): {response.error.message}")
- 
-            if response.full_text_annotation:
-                return response.full_text_annotation.text
-            else:
-                return "No text found in image."
- 
-        else:
-            return f"(OCR Error: Unsupported MIME type '{mime_type}'. Supported: PDF, PNG, JPG, GIF, TIFF, DOCX.)"
- 
+        result = await extract_cv_text(content, mime_type)
+
+        logger.info("cv_extracted", extra={
+            "mime_type": mime_type,
+            "pages": len(result.pages),
+            "total_pages": result.total_pages,
+            "skipped_pages": result.skipped_pages,
+            "ocr_pages": sum(1 for p in result.pages if p.source == "ocr"),
+        })
+        if result.text:
+            return result.text, result
+        return "No text found in file.", result
+
+    except ValueError as e:
+        return f"(OCR Error: {e})", None
     except FileNotFoundError:
-        print("CRITICAL ERROR: OCR key file not found.")
-        return f"(Server Error: OCR key file not found.)"
+        logger.critical("ocr_key_missing")
+        return f"(Server Error: OCR key file not found.)", None
     except Exception as e:
-        print(f"OCR Error: {e}")
-        return f"(Error processing OCR: {e})"
+        logger.error("ocr_failed", extra={"error": str(e)})
+        return f"(Error processing OCR: {e})", None
 
-async def transcribe_audio(audio_content: bytes, language_code: str = "en-US") -> str:
+async def transcribe_audio(audio_content: bytes | memoryview, language_code: str = "en-US") -> str:
     """
     Uses Google Cloud Speech-to-Text to convert audio bytes to text using the service account key.
     Supports English (en-US) and Vietnamese (vi-VN).
     """
     try:
-        speech_key_path = get_credential_path("speech_key.json")
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = speech_key_path
-        client = speech.SpeechAsyncClient()
- 
-        audio = speech.RecognitionAudio(content=audio_content)
+        client = get_speech_client()
  
-        print(f"Audio content size: {len(audio_content)} bytes")
-        print(f"Language code: {language_code}")
+        audio = speech.RecognitionAudio(content=bytes(audio_content))
  
         # Map Vietnamese language code to proper Google Cloud code
         if language_code.lower() in ["vi", "vi-vn", "vietnamese"]:
@@ -109,11 +85,12 @@ async def transcribe_audio(audio_content: bytes, language_code: str = "en-US") -
             model=model_name,
         )
  
-        print(f"Sending audio to Google Speech-to-Text with model: {model_name}...")
- 
-        response = await client.recognize(config=config, audio=audio)
+        async with track_external_call("stt", "recognize"):
+            response = await client.recognize(config=config, audio=audio)
  
-        print(f"Response received: {len(response.results)} results")
+        logger.debug("stt_response", extra={
+            "results": len(response.results), "model": model_name, "language": language_code,
+        })
  
         if not response.results:
             return "(Error: No speech detected in audio)"
@@ -127,58 +104,98 @@ async def transcribe_audio(audio_content: bytes, language_code: str = "en-US") -
         if not transcript or not transcript.strip():
             return "(Error: No speech could be recognized)"
  
-        print(f"Transcript: {transcript}")
         return transcript.strip()
  
     except FileNotFoundError:
-        print("CRITICAL ERROR: Speech key file not found.")
+        logger.critical("stt_key_missing")
         return "(Server Error: STT key file not found)"
     except Exception as e:
-        print(f"Speech-to-Text Error: {type(e).__name__}: {e}")
+        logger.error("stt_failed", extra={"error_type": type(e).__name__, "error": str(e)})
         return f"(Error processing audio: {e})"
 
+async def extract_cv_upload(upload: IngestedUpload) -> tuple[dict | None, str | None]:
+    """
+    Returns the /upload-cv payload for an ingested file, from the OCR cache
+    when possible, or (None, error string).
+    """
+    with upload.view() as content:
+        mime_type = upload.mime_type
+
+        key = cache_key(upload.sha256, mime_type, EXTRACTION_MODE)
+        cached = await run_in_threadpool(OCR_CACHE.get, key)
+        if cached is not None:
+            logger.info("ocr_cache_hit", extra={"mime_type": mime_type, "bytes": upload.size})
+            return {**cached, "cached": True}, None
+
+        cv_text, ocr_result = await extract_cv_file(content, mime_type)
+ 
+    if "(Error" in cv_text or "(Server Error" in cv_text or ocr_result is None:
+        return None, cv_text
+
+    payload = {
+        "cv_text": cv_text,
+        "pages": ocr_result.timings(),
+        "skipped_pages": ocr_result.skipped_pages,
+    }
+    await run_in_threadpool(OCR_CACHE.put, key, payload)
+    return {**payload, "cached": False}, None
+
 @router.post("/upload-cv")
 async def handle_image_request(file: UploadFile = File(...)):
-    content = await file.read()
-    mime_type = file.content_type
-    cv_text = await run_in_threadpool(ocr_cv_file_sync, content, mime_type)
- 
-    if "(Error" in cv_text or "(Server Error" in cv_text:
-        return JSONResponse(status_code=500, content={"error": cv_text})
-    return JSONResponse(content={"cv_text": cv_text})
+    try:
+        upload = await ingest_upload(file, MAX_CV_UPLOAD_BYTES)
+    except UploadTooLarge as e:
+        return JSONResponse(status_code=413, content={"error": str(e)})
+
+    with upload:
+        payload, error = await extract_cv_upload(upload)
+
+    if error:
+        return JSONResponse(status_code=500, content={"error": error})
+    return JSONResponse(content=payload)
+
+@router.get("/ocr-cache/stats")
+async def ocr_cache_stats():
+    return JSONResponse(content=await run_in_threadpool(OCR_CACHE.stats))
 
 @router.post("/process-voice")
 async def handle_voice_request(audio: UploadFile = File(...), language: str = Form("en-US")):
-    print(f"===== VOICE PROCESSING START =====")
-    print(f"Received audio file: {audio.filename}")
-    print(f"Content type: {audio.content_type}")
-    print(f"Language: {language}")
- 
     try:
-        audio_content = await audio.read()
-        print(f"Audio size: {len(audio_content)} bytes")
+        try:
+            upload = await ingest_upload(audio, MAX_AUDIO_UPLOAD_BYTES)
+        except UploadTooLarge as e:
+            return JSONResponse(
+                status_code=413,
+                content={"error": str(e), "transcription": ""}
+            )
+        logger.info("voice_received", extra={
+            "bytes": upload.size,
+            "content_type": audio.content_type,
+            "sniffed_type": upload.sniffed_type,
+            "language": language,
+        })
  
-        if len(audio_content) < 1000:
+        if upload.size < 1000:
+            upload.close()
             return JSONResponse(
                 status_code=400,
                 content={"error": "Audio file too short", "transcription": ""}
             )
  
-        transcribed_text = await transcribe_audio(audio_content, language)
+        with upload, upload.view() as audio_content:
+            transcribed_text = await transcribe_audio(audio_content, language)
  
         if "(Error" in transcribed_text or "(Server Error" in transcribed_text:
-            print(f"Transcription error: {transcribed_text}")
+            logger.warning("voice_transcription_error", extra={"error": transcribed_text})
             return JSONResponse(
                 status_code=500,
                 content={"error": transcribed_text, "transcription": ""}
             )
  
-        print(f"Successfully transcribed: {transcribed_text}")
-        print(f"===== VOICE PROCESSING END =====")
+        logger.info("voice_transcribed", extra={"chars": len(transcribed_text)})
         return JSONResponse(content={"transcription": transcribed_text})
     except Exception as e:
-        print(f"Voice processing exception: {type(e).__name__}: {e}")
-        print(f"===== VOICE PROCESSING ERROR =====")
+        logger.exception("voice_processing_failed")
         return JSONResponse(
             status_code=500,
             content={"error": str(e), "transcription": ""}
@@ -192,44 +209,9 @@ async def text_to_speech(request: TextToSpeechRequest):
     Returns base64 encoded audio.
     """
     try:
-        speech_key_path = get_credential_path("speech_key.json")
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = speech_key_path
-        client = texttospeech.TextToSpeechAsyncClient()
- 
-        synthesis_input = texttospeech.SynthesisInput(text=request.text)
- 
-        # Get language from request, default to en-US
-        language = request.language.lower() if request.language else "en-US"
- 
-        # Map Vietnamese language code to proper Google Cloud code
-        if language in ["vi", "vi-vn", "vietnamese"]:
-            language_code = "vi-VN"
-            # Use a Vietnamese voice (female neural voice)
-            voice_name = "vi-VN-Neural2-A"
-        else:
-            language_code = "en-US"
-            voice_name = "en-US-Neural2-F"
- 
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=language_code,
-            name=voice_name,
-            ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
-        )
- 
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=0.85,
-            pitch=-2.0,
-            volume_gain_db=0.0
-        )
- 
-        response = await client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config
-        )
+        audio_content = await synthesize_speech(request.text, request.language)
  
-        audio_base64 = base64.b64encode(response.audio_content).decode('utf-8')
+        audio_base64 = base64.b64encode(audio_content).decode('utf-8')
  
         return JSONResponse(content={
             "audio": audio_base64,
@@ -237,7 +219,7 @@ async def text_to_speech(request: TextToSpeechRequest):
         })
  
     except Exception as e:
-        print(f"Text-to-Speech Error: {e}")
+        logger.error("tts_failed", extra={"error": str(e)})
         return JSONResponse(
             status_code=500,
             content={"error": f"Failed to synthesize speech: {str(e)}"}
@@ -0,0 +1,144 @@
+# api/pipeline_endpoints.py
+
+from fastapi import APIRouter, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import re
+import time
+# Tái sử dụng logic của các router khác
+from api.ai_endpoints import get_cv_analysis
+from api.media_endpoints import extract_cv_upload
+from api import util_endpoints
+from api.util_endpoints import detect_common_skills, match_jobs
+from core.responses import JSONResponse, dumps
+from core.config import MAX_CV_UPLOAD_BYTES
+from core.providers import GEMINI_MODEL
+from core.models import CVAnalysisRequest
+from core.uploads import IngestedUpload, UploadTooLarge, ingest_upload
+from core.log import get_logger
+
+router = APIRouter(default_response_class=JSONResponse)
+logger = get_logger(__name__)
+
+def sse_event(event: str, data: dict) -> str:
+    payload = dumps(data).decode("utf-8")
+    return f"event: {event}\ndata: {payload}\n\n"
+
+def parse_experience_years(value) -> int:
+    """Gemini returns experience_years as free text ("3 năm", "2-3")."""
+    if isinstance(value, (int, float)):
+        return max(int(value), 0)
+    match = re.search(r'\d+', str(value or ""))
+    return int(match.group()) if match else 0
+
+async def run_cv_pipeline(upload: IngestedUpload, role: str, organization: str):
+    """
+    upload → extract → analyze → recommend, yielding one SSE event per stage.
+    Job pre-filtering with skills detected locally in the CV text runs while
+    Gemini is still analyzing.
+    """
+    started = time.perf_counter()
+    timings = {}
+    analysis_task = None
+
+    def elapsed_ms(since: float) -> float:
+        return round((time.perf_counter() - since) * 1000, 1)
+
+    try:
+        # --- 1. Extract text (cache → local parsers → Vision) ---
+        stage_start = time.perf_counter()
+        with upload:
+            extracted, error = await extract_cv_upload(upload)
+        timings["extract"] = elapsed_ms(stage_start)
+        if error:
+            yield sse_event("error", {"stage": "extract", "error": error})
+            return
+        yield sse_event("extract", {**extracted, "elapsed_ms": timings["extract"]})
+        cv_text = extracted["cv_text"]
+
+        # --- 2. Gemini analysis and job pre-filtering, overlapped ---
+        stage_start = time.perf_counter()
+        if GEMINI_MODEL is not None:
+            analysis_task = asyncio.create_task(get_cv_analysis(
+                CVAnalysisRequest(cv_text=cv_text, role=role, organization=organization)
+            ))
+
+        if util_endpoints.JOB_DATABASE:
+            detected_skills = detect_common_skills(cv_text)
+            preview = await run_in_threadpool(match_jobs, role, detected_skills)
+            timings["jobs_preview"] = elapsed_ms(stage_start)
+            yield sse_event("jobs_preview", {
+                "skills": detected_skills,
+                "jobs": preview,
+                "elapsed_ms": timings["jobs_preview"],
+            })
+
+        if analysis_task is None:
+            yield sse_event("error", {
+                "stage": "analysis",
+                "error": "Gemini is not configured. Set env var GOOGLE_API_KEY (or GEMINI_API_KEY) on the server.",
+            })
+            return
+
+        try:
+            analysis, raw_text = await analysis_task
+        except Exception as e:
+            logger.error("pipeline_analysis_failed", extra={"error": str(e)})
+            yield sse_event("error", {"stage": "analysis", "error": str(e)})
+            return
+        timings["analysis"] = elapsed_ms(stage_start)
+        if analysis is None:
+            yield sse_event("error", {
+                "stage": "analysis",
+                "error": "Could not parse AI response",
+                "raw": raw_text[:500],
+            })
+            return
+        yield sse_event("analysis", {**analysis, "elapsed_ms": timings["analysis"]})
+
+        # --- 3. Final recommendation with the skills Gemini extracted ---
+        if util_endpoints.JOB_DATABASE:
+            stage_start = time.perf_counter()
+            skills = analysis.get("skills") or []
+            jobs = await run_in_threadpool(
+                match_jobs,
+                role or analysis.get("extracted_role", ""),
+                [s for s in skills if isinstance(s, str)],
+                parse_experience_years(analysis.get("experience_years")),
+            )
+            timings["jobs"] = elapsed_ms(stage_start)
+            yield sse_event("jobs", {"jobs": jobs, "elapsed_ms": timings["jobs"]})
+
+        timings["total"] = elapsed_ms(started)
+        logger.info("pipeline_done", extra={"timings": timings})
+        yield sse_event("done", {"timings": timings})
+
+    except Exception as e:
+        logger.exception("pipeline_failed")
+        yield sse_event("error", {"stage": "pipeline", "error": str(e)})
+    finally:
+        upload.close()
+        if analysis_task is not None and not analysis_task.done():
+            analysis_task.cancel()
+
+@router.post("/cv-pipeline")
+async def cv_pipeline(
+    file: UploadFile = File(...),
+    role: str = Form(""),
+    organization: str = Form(""),
+):
+    """
+    One-shot CareerCoach flow. Streams Server-Sent Events:
+    extract, jobs_preview, analysis, jobs, done (or error), each with its timing.
+    """
+    try:
+        upload = await ingest_upload(file, MAX_CV_UPLOAD_BYTES)
+    except UploadTooLarge as e:
+        return JSONResponse(status_code=413, content={"error": str(e)})
+
+    return StreamingResponse(
+        run_cv_pipeline(upload, role, organization),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,53 +1,26 @@
 # api/util_endpoints.py
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from core.responses import JSON_MEDIA_TYPE, JSONResponse, dumps
 from core.models import JobRecommendationRequest
-import json
-import os
+from core.config import JOB_MATCHING_MODE, JOB_MATCHING_MODES, JOB_SEMANTIC_CANDIDATES, JOB_SEMANTIC_WEIGHT
+from core.job_index import JobIndex, build_index, query_terms
+from core.job_loader import load_jobs
+from core.log import get_logger
+from core.metrics import JOB_MATCHING_LATENCY
 import re
-import requests
-
-router = APIRouter()
-
-def get_job_data() -> list:
-    """Load job data for local + Render deployment.
-
-    Priority:
-    1) Fetch from JSON_DATA_URL (npoint.io)
-    2) Fallback to local backend/job_data.json
-    3) Return [] if both fail
-    """
-
-    url = os.getenv("JSON_DATA_URL")
-    if url:
-        try:
-            resp = requests.get(url, timeout=20)
-            if resp.status_code == 200:
-                data = resp.json()
-                return data if isinstance(data, list) else []
-            print(f"Warning: JSON_DATA_URL returned status {resp.status_code}")
-        except Exception as e:
-            print(f"Warning: failed to fetch JSON_DATA_URL: {e}")
-
-    try:
-        # util_endpoints.py is in backend/api/, so go up one level to backend/
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        data_path = os.path.join(base_dir, "..", "job_data.json")
-        if not os.path.exists(data_path):
-            print(f"Không tìm thấy file data tại: {data_path}")
-            return []
-
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except Exception as e:
-        print(f"Lỗi load data: {e}")
-        return []
+import threading
+import time
+from typing import NamedTuple
 
+router = APIRouter(default_response_class=JSONResponse)
+logger = get_logger(__name__)
 
 # --- Load once at startup (global cache) ---
-JOB_DATABASE = get_job_data()
+# The TF-IDF index is built while the feed streams in when it is the default ranking
+JOB_DATABASE, _startup_index, JOB_LOAD_REPORT = load_jobs(with_index=JOB_MATCHING_MODE != "rule")
 
 # Danh sách skill phổ biến để gợi ý thiếu
 COMMON_SKILLS = {
@@ -56,91 +29,262 @@ COMMON_SKILLS = {
     'typescript', 'golang', 'rust', 'c++', 'c#', '.net', 'flutter', 'swift'
 }
 
+def detect_common_skills(text: str) -> list[str]:
+    """Find COMMON_SKILLS mentioned in free text (e.g. a CV) without the LLM."""
+    text = text.lower()
+    return sorted(
+        skill for skill in COMMON_SKILLS
+        if re.search(r'\b' + re.escape(skill) + r'\b', text)
+    )
+
+# Sparse TF-IDF index over JOB_DATABASE, rebuilt when the list is replaced.
+# Requests never build it on the event loop: get_ready_job_index() starts a
+# background build and the caller falls back to rule mode until it is done.
+_job_index = _startup_index
+_job_index_source = JOB_DATABASE if _startup_index is not None else None
+_job_index_lock = threading.Lock()
+_job_index_building = None  # job list a background build is running for
+
+def _build_job_index(jobs: list) -> JobIndex:
+    global _job_index, _job_index_source
+    started = time.perf_counter()
+    index = build_index(jobs)
+    with _job_index_lock:
+        _job_index, _job_index_source = index, jobs
+    logger.info("job_index_built", extra={
+        **index.stats(), "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+    return index
+
+def _build_job_index_background(jobs: list) -> None:
+    global _job_index_building
+    try:
+        _build_job_index(jobs)
+    except Exception:
+        logger.exception("job_index_build_failed")
+    finally:
+        with _job_index_lock:
+            if _job_index_building is jobs:
+                _job_index_building = None
+
+def get_job_index() -> tuple[JobIndex, list]:
+    """Return (index, the job list it was built from), building it here if needed (blocking)."""
+    jobs = JOB_DATABASE
+    with _job_index_lock:
+        if _job_index is not None and _job_index_source is jobs:
+            return _job_index, jobs
+    return _build_job_index(jobs), jobs
+
+def get_ready_job_index() -> tuple[JobIndex, list] | None:
+    """(index, jobs) when the index of JOB_DATABASE is built, else None after starting a background build."""
+    global _job_index_building
+    jobs = JOB_DATABASE
+    with _job_index_lock:
+        if _job_index is not None and _job_index_source is jobs:
+            return _job_index, jobs
+        if _job_index_building is not jobs:
+            _job_index_building = jobs
+            threading.Thread(
+                target=_build_job_index_background, args=(jobs,), name="job-index-build", daemon=True
+            ).start()
+    return None
+
+def score_job(job: dict, user_skills: set[str], user_role: str, experience_years: int) -> tuple[int, list[str], str]:
+    """Rule-based score of one job: (score, matched skills, lowercase full text)."""
+    # Tạo text tổng hợp để search
+    # Thêm dấu cách để tách các từ dính nhau
+    job_name = job.get('job_name', '')
+    job_desc = job.get('job_description', '')
+    job_req = job.get('job_requirement', '')
+    
+    # Text full để kiểm tra ngữ cảnh
+    full_text = f"{job_name} {job_desc} {job_req}".lower()
+    
+    # --- 2. THUẬT TOÁN TÍNH ĐIỂM (Scoring) ---
+    match_score = 0
+    required_skills_found = []
+
+    # Check Skills (Dùng regex để bắt chính xác từ)
+    # Ví dụ: chỉ bắt "java" nếu nó đứng riêng lẻ, không bắt trong "javascript"
+    for skill in user_skills:
+        # \b là ranh giới từ (word boundary)
+        # re.escape để tránh lỗi nếu skill có ký tự đặc biệt (ví dụ C++)
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, full_text):
+            match_score += 15
+            required_skills_found.append(skill)
+
+    # Check Role (Ưu tiên điểm cao nếu khớp title)
+    if user_role:
+        if user_role in job_name.lower():
+            match_score += 30 # Khớp tiêu đề quan trọng hơn
+        elif user_role in full_text:
+            match_score += 10
+
+    # Check Experience (Logic đơn giản)
+    exp_req = 0
+    if 'senior' in job_name.lower(): exp_req = 3
+    elif 'junior' in job_name.lower() or 'fresher' in job_name.lower(): exp_req = 0
+    elif 'mid' in job_name.lower(): exp_req = 2
+    
+    # Phạt điểm nếu kinh nghiệm quá chênh lệch
+    if experience_years < exp_req:
+        match_score -= 10
+    else:
+        match_score += 5
+
+    return match_score, required_skills_found, full_text
+
+def missing_skills(full_text: str, user_skills: set[str]) -> list[str]:
+    # Tìm skill còn thiếu (Missing Skills)
+    missing = []
+    for tech in COMMON_SKILLS:
+        if tech not in user_skills:
+            # Check xem job có cần tech này không
+            if re.search(r'\b' + re.escape(tech) + r'\b', full_text):
+                missing.append(tech)
+    return missing
+
+def job_static(job: dict) -> dict:
+    """The part of a job result that does not depend on the query."""
+    return {
+        "job_name": job.get('job_name', ''),
+        "company_name": job.get("company_name", "Unknown"),
+        "job_url": job.get("job_url", "#"), # URL THẬT
+        "job_description": job.get('job_description', '')[:200] + "...",
+        "job_requirement": job.get('job_requirement', '')[:200] + "...",
+    }
+
+def job_result(job: dict, ranked: "RankedJob") -> dict:
+    result = {
+        **job_static(job),
+        "matchScore": ranked.score,
+        "requiredSkills": ranked.required_skills[:5],
+        "missingSkills": ranked.missing_skills[:5]
+    }
+    if ranked.similarity is not None:
+        result["similarity"] = round(ranked.similarity, 4)
+    return result
+
+# Pre-encoded job_static() of every job in JOB_DATABASE, without the closing
+# brace, so /recommend-jobs only encodes the per-query fields
+_job_fragments: list[bytes] = []
+_job_fragments_source = None
+
+def get_job_fragments() -> list[bytes]:
+    global _job_fragments, _job_fragments_source
+    jobs = JOB_DATABASE
+    if _job_fragments_source is not jobs:
+        _job_fragments = [dumps(job_static(job))[:-1] for job in jobs]
+        _job_fragments_source = jobs
+    return _job_fragments
+
+get_job_fragments()
+
+class RankedJob(NamedTuple):
+    score: int
+    position: int
+    required_skills: list[str]
+    missing_skills: list[str]
+    similarity: float | None
+
+def rank_jobs(role: str, skills: list[str], experience_years: int = 0, limit: int = 20,
+              mode: str | None = None) -> tuple[list[dict], list[RankedJob]]:
+    """
+    Score jobs and return (the job list that was ranked, the best ``limit``).
+
+    - ``rule``: Rule-Based Filtering over every job.
+    - ``tfidf``: top-k cosine similarity on the sparse index (catches synonyms
+      and related titles, weighs skills by how much they dominate a job).
+    - ``hybrid``: index candidates re-scored by the rules and blended with
+      the similarity by JOB_SEMANTIC_WEIGHT.
+
+    tfidf/hybrid fall back to rule while the index is still being built.
+    """
+    mode = (mode or JOB_MATCHING_MODE).lower()
+    if mode not in JOB_MATCHING_MODES:
+        raise ValueError(f"Unknown matching mode: {mode}")
+    ready_index = get_ready_job_index() if mode != "rule" else None
+    if mode != "rule" and ready_index is None:
+        logger.info("job_index_not_ready", extra={"requested_mode": mode})
+        mode = "rule"
+    started = time.perf_counter()
+
+    # Chuẩn hóa dữ liệu user
+    user_skills = set(skill.lower().strip() for skill in skills)
+    user_role = role.lower().strip()
+
+    # (score, position, matched skills, full text, similarity); missing skills
+    # are only looked up for the top ``limit``
+    scored = []
+
+    if mode == "rule":
+        jobs = JOB_DATABASE
+        for position, job in enumerate(jobs):
+            match_score, required_skills_found, full_text = score_job(job, user_skills, user_role, experience_years)
+
+            # --- 3. LỌC KẾT QUẢ ---
+            if match_score >= 15: # Ngưỡng điểm để hiển thị
+                scored.append((min(match_score, 100), position, required_skills_found, full_text, None))
+    else:
+        index, jobs = ready_index
+        k = max(limit, JOB_SEMANTIC_CANDIDATES) if mode == "hybrid" else limit
+        for position, similarity in index.search(query_terms(role, skills), k=k):
+            match_score, required_skills_found, full_text = score_job(jobs[position], user_skills, user_role, experience_years)
+            score = similarity * 100
+            if mode == "hybrid":
+                rule_score = min(max(match_score, 0), 100)
+                score = (1 - JOB_SEMANTIC_WEIGHT) * rule_score + JOB_SEMANTIC_WEIGHT * score
+            scored.append((min(max(round(score), 0), 100), position, required_skills_found, full_text, similarity))
+
+    # Sắp xếp điểm cao nhất lên đầu
+    scored.sort(key=lambda x: x[0], reverse=True)
+    ranked = [
+        RankedJob(score, position, required_skills_found, missing_skills(full_text, user_skills), similarity)
+        for score, position, required_skills_found, full_text, similarity in scored[:limit]
+    ]
+
+    JOB_MATCHING_LATENCY.observe(time.perf_counter() - started, mode=mode)
+    return jobs, ranked
+
+def match_jobs(role: str, skills: list[str], experience_years: int = 0, limit: int = 20,
+               mode: str | None = None) -> list[dict]:
+    """rank_jobs() as a list of result dicts."""
+    jobs, ranked = rank_jobs(role, skills, experience_years, limit, mode)
+    return [job_result(jobs[r.position], r) for r in ranked]
+
+def encode_jobs_response(jobs: list[dict], ranked: list[RankedJob]) -> bytes:
+    """``{"jobs": [...]}`` assembled from the pre-encoded fragments."""
+    fragments = get_job_fragments() if jobs is JOB_DATABASE else None
+    parts = []
+    for r in ranked:
+        static = fragments[r.position] if fragments is not None else dumps(job_static(jobs[r.position]))[:-1]
+        dynamic = (
+            b',"matchScore":' + str(r.score).encode()
+            + b',"requiredSkills":' + dumps(r.required_skills[:5])
+            + b',"missingSkills":' + dumps(r.missing_skills[:5])
+        )
+        if r.similarity is not None:
+            dynamic += b',"similarity":' + dumps(round(r.similarity, 4))
+        parts.append(static + dynamic + b"}")
+    return b'{"jobs":[' + b",".join(parts) + b"]}"
+
 @router.post("/recommend-jobs")
 async def recommend_jobs(data: JobRecommendationRequest):
     """
-    Match jobs using Rule-Based Filtering (No LLM).
+    Match jobs using Rule-Based Filtering or the TF-IDF index (No LLM).
     """
     try:
         if not JOB_DATABASE:
             return JSONResponse(status_code=500, content={"error": "Server chưa có dữ liệu việc làm."})
+        if data.mode and data.mode.lower() not in JOB_MATCHING_MODES:
+            return JSONResponse(status_code=400, content={"error": f"mode phải là một trong {', '.join(JOB_MATCHING_MODES)}"})
 
-        # Chuẩn hóa dữ liệu user
-        user_skills = set(skill.lower().strip() for skill in data.skills)
-        user_role = data.role.lower().strip()
-        
-        matched_jobs = []
-
-        for job in JOB_DATABASE:
-            # Tạo text tổng hợp để search
-            # Thêm dấu cách để tách các từ dính nhau
-            job_name = job.get('job_name', '')
-            job_desc = job.get('job_description', '')
-            job_req = job.get('job_requirement', '')
-            
-            # Text full để kiểm tra ngữ cảnh
-            full_text = f"{job_name} {job_desc} {job_req}".lower()
-            
-            # --- 2. THUẬT TOÁN TÍNH ĐIỂM (Scoring) ---
-            match_score = 0
-            required_skills_found = []
-
-            # Check Skills (Dùng regex để bắt chính xác từ)
-            # Ví dụ: chỉ bắt "java" nếu nó đứng riêng lẻ, không bắt trong "javascript"
-            for skill in user_skills:
-                # \b là ranh giới từ (word boundary)
-                # re.escape để tránh lỗi nếu skill có ký tự đặc biệt (ví dụ C++)
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, full_text):
-                    match_score += 15
-                    required_skills_found.append(skill)
-
-            # Check Role (Ưu tiên điểm cao nếu khớp title)
-            if user_role:
-                if user_role in job_name.lower():
-                    match_score += 30 # Khớp tiêu đề quan trọng hơn
-                elif user_role in full_text:
-                    match_score += 10
-
-            # Check Experience (Logic đơn giản)
-            exp_req = 0
-            if 'senior' in job_name.lower(): exp_req = 3
-            elif 'junior' in job_name.lower() or 'fresher' in job_name.lower(): exp_req = 0
-            elif 'mid' in job_name.lower(): exp_req = 2
-            
-            # Phạt điểm nếu kinh nghiệm quá chênh lệch
-            if data.experience_years < exp_req:
-                match_score -= 10
-            else:
-                match_score += 5
-
-            # --- 3. LỌC KẾT QUẢ ---
-            if match_score >= 15: # Ngưỡng điểm để hiển thị
-                
-                # Tìm skill còn thiếu (Missing Skills)
-                missing = []
-                for tech in COMMON_SKILLS:
-                    if tech not in user_skills:
-                        # Check xem job có cần tech này không
-                        if re.search(r'\b' + re.escape(tech) + r'\b', full_text):
-                            missing.append(tech)
-
-                matched_jobs.append({
-                    "job_name": job_name,
-                    "company_name": job.get("company_name", "Unknown"),
-                    "job_url": job.get("job_url", "#"), # URL THẬT
-                    "job_description": job_desc[:200] + "...",
-                    "job_requirement": job_req[:200] + "...",
-                    "matchScore": min(max(match_score, 0), 100), # Clamp 0-100
-                    "requiredSkills": required_skills_found[:5],
-                    "missingSkills": missing[:5]
-                })
-
-        # Sắp xếp điểm cao nhất lên đầu
-        matched_jobs.sort(key=lambda x: x['matchScore'], reverse=True)
-        
-        return JSONResponse(content={"jobs": matched_jobs[:20]})
+        jobs, ranked = await run_in_threadpool(
+            rank_jobs, data.role, data.skills, data.experience_years, mode=data.mode
+        )
+        return Response(content=encode_jobs_response(jobs, ranked), media_type=JSON_MEDIA_TYPE)
 
     except Exception as e:
-        print(f"Error logic: {str(e)}")
-        return JSONResponse(status_code=500, content={"error": str(e)})
\ No newline at end of file
+        logger.exception("recommend_jobs_failed")
+        return JSONResponse(status_code=500, content={"error": str(e)})
@@ -0,0 +1,187 @@
+# bench/bench_matching.py
+
+"""Benchmark the /recommend-jobs hot path on synthetic datasets.
+
+Run from backend/:
+
+    python -m bench.bench_matching --sizes 1000 10000 100000 --queries 200
+
+For every dataset size it measures
+- ``scoring``: ``match_jobs`` alone (the rule-based scoring loop),
+- ``endpoint``: the ``recommend_jobs`` handler including request model
+  validation and JSON response encoding,
+and reports latency percentiles, throughput and peak traced memory.
+``--mode`` selects the ranking (rule, tfidf or hybrid); for the index modes
+``load_s`` includes building the TF-IDF index (and, always, the
+pre-encoded job fragments). Each
+section stops early once ``--time-budget`` seconds are spent, so the 1M-job
+sizes still finish on an O(jobs) scorer. Results are written as JSON (tagged
+with the git commit) so two runs can be compared with ``python -m bench.compare``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Never hit the network feed while benchmarking
+os.environ.pop("JSON_DATA_URL", None)
+
+from api import util_endpoints  # noqa: E402
+from core.config import JOB_MATCHING_MODES  # noqa: E402
+from core.models import JobRecommendationRequest  # noqa: E402
+from bench.common import git_commit, percentile  # noqa: E402
+from bench.synth import generate_jobs, generate_queries  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def summarize(latencies_ms: list[float], wall_s: float, peak_bytes: int) -> dict:
+    ordered = sorted(latencies_ms)
+    return {
+        "queries": len(ordered),
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p90_ms": round(percentile(ordered, 90), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+        "mean_ms": round(statistics.fmean(ordered), 3) if ordered else 0.0,
+        "throughput_qps": round(len(ordered) / wall_s, 2) if wall_s else 0.0,
+        "peak_traced_bytes": peak_bytes,
+    }
+
+
+def traced_peak(fn, queries: list[dict]) -> int:
+    """Peak Python allocations while running a few queries (tracemalloc is slow)."""
+
+    tracemalloc.start()
+    try:
+        for query in queries:
+            fn(query)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def timed_run(run, queries: list[dict], time_budget: float) -> tuple[list[float], float]:
+    latencies = []
+    wall_start = time.perf_counter()
+    for query in queries:
+        started = time.perf_counter()
+        run(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if time.perf_counter() - wall_start > time_budget:
+            break
+    return latencies, time.perf_counter() - wall_start
+
+
+def bench_scoring(queries: list[dict], args) -> dict:
+    def run(query):
+        return util_endpoints.match_jobs(
+            query["role"], query["skills"], query["experience_years"], mode=args.mode
+        )
+
+    latencies, wall_s = timed_run(run, queries, args.time_budget)
+    return summarize(latencies, wall_s, traced_peak(run, queries[:args.memory_sample]))
+
+
+def bench_endpoint(queries: list[dict], args) -> dict:
+    loop = asyncio.new_event_loop()
+
+    def run(query):
+        request = JobRecommendationRequest(**query, mode=args.mode)
+        response = loop.run_until_complete(util_endpoints.recommend_jobs(request))
+        if response.status_code != 200:
+            raise RuntimeError(f"recommend_jobs returned {response.status_code}: {response.body[:200]}")
+        return response
+
+    try:
+        latencies, wall_s = timed_run(run, queries, args.time_budget)
+        return summarize(latencies, wall_s, traced_peak(run, queries[:args.memory_sample]))
+    finally:
+        loop.close()
+
+
+def run_size(size: int, args) -> dict:
+    started = time.perf_counter()
+    jobs = generate_jobs(size, args.seed)
+    generate_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    util_endpoints.JOB_DATABASE = jobs
+    util_endpoints.get_job_fragments()
+    if args.mode != "rule":
+        util_endpoints.get_job_index()
+    load_s = time.perf_counter() - started
+
+    queries = generate_queries(args.queries, args.seed)
+    # Warm-up (regex cache, lazy imports)
+    for query in queries[:min(2, len(queries))]:
+        util_endpoints.match_jobs(query["role"], query["skills"], query["experience_years"], mode=args.mode)
+
+    result = {
+        "jobs": size,
+        "generate_s": round(generate_s, 3),
+        "load_s": round(load_s, 3),
+        "scoring": bench_scoring(queries, args),
+        "endpoint": bench_endpoint(queries, args),
+    }
+    if resource is not None:
+        result["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        f"{size:>9} jobs | scoring p50 {result['scoring']['p50_ms']:>9.2f} ms"
+        f" p99 {result['scoring']['p99_ms']:>9.2f} ms {result['scoring']['throughput_qps']:>8.2f} qps"
+        f" | endpoint p50 {result['endpoint']['p50_ms']:>9.2f} ms p99 {result['endpoint']['p99_ms']:>9.2f} ms"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job matching")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--time-budget", type=float, default=30.0,
+                        help="seconds per section before stopping early")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=JOB_MATCHING_MODES, default="rule",
+                        help="ranking mode passed to match_jobs")
+    parser.add_argument("--memory-sample", type=int, default=3,
+                        help="queries re-run under tracemalloc for peak memory")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="result file (default: bench/results/<time>-<commit>.json)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        "benchmark": "matching",
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "mode": args.mode,
+        "results": [run_size(size, args) for size in args.sizes],
+    }
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"matching-{args.mode}-{stamp}-{commit}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# bench/compare.py
+
+"""Compare two benchmark result files.
+
+    python -m bench.compare bench/results/old.json bench/results/new.json --threshold 0.10
+
+Prints the relative change of every latency/throughput metric per dataset
+size and exits with status 1 if any metric regressed by more than the
+threshold.
+"""
+
+import argparse
+import json
+import sys
+
+# metric -> True when higher is better
+METRICS = {
+    "p50_ms": False,
+    "p90_ms": False,
+    "p99_ms": False,
+    "throughput_qps": True,
+    "peak_traced_bytes": False,
+}
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: dict, new: dict, threshold: float) -> list[str]:
+    regressions = []
+    base_by_size = {r["jobs"]: r for r in base["results"]}
+
+    for result in new["results"]:
+        size = result["jobs"]
+        if size not in base_by_size:
+            continue
+        for section, metrics in result.items():
+            if not isinstance(metrics, dict):
+                continue
+            base_metrics = base_by_size[size].get(section, {})
+            for metric, higher_is_better in METRICS.items():
+                old, cur = base_metrics.get(metric), metrics.get(metric)
+                if not old or cur is None:
+                    continue
+                change = (cur - old) / old
+                worse = -change if higher_is_better else change
+                flag = "REGRESSION" if worse > threshold else ""
+                print(f"{size:>9} {section:<10} {metric:<18} {old:>14.3f} -> {cur:>14.3f} {change:+8.1%} {flag}")
+                if flag:
+                    regressions.append(f"{size}/{section}/{metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    print(f"base {base.get('commit')} vs new {new.get('commit')}")
+    regressions = compare(base, new, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
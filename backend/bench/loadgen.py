@@ -0,0 +1,282 @@
+# bench/loadgen.py
+
+"""End-to-end async load generator for the backend.
+
+Each virtual user runs the InterviewWarmup/CareerCoach session flow:
+upload CV → analyze → generate questions → N × (TTS question → voice answer
+→ Gemini evaluation). Concurrency is ramped level by level; for every level
+it reports per-endpoint p50/p95/p99 latency, error counts, throughput and
+event-loop lag, then names the saturation point (the level after which
+throughput stops growing by at least ``--saturation-gain``).
+
+By default the app runs in-process with the fake providers, so no Google
+credentials or network are needed (run from backend/):
+
+    python -m bench.loadgen --concurrency 1 4 16 64 --duration 20 --answers 3
+    FAKE_GEMINI_LATENCY_MS=1500 FAKE_RATE_LIMIT_RATE=0.02 python -m bench.loadgen
+
+Against a running server (loop lag is then measured on the client side):
+
+    python -m bench.loadgen --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import statistics
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from bench.common import git_commit, percentile
+from core.uploads import DOCX_MIME_TYPE
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class LevelStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.sessions = 0
+        self.loop_lag_ms = []
+
+    def record(self, endpoint: str, elapsed_ms: float, status: int | str):
+        self.latencies[endpoint].append(elapsed_ms)
+        self.statuses[endpoint][str(status)] += 1
+
+    def summary(self, wall_s: float) -> dict:
+        endpoints = {}
+        total_requests = 0
+        total_errors = 0
+        for endpoint, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            statuses = dict(self.statuses[endpoint])
+            errors = sum(n for s, n in statuses.items() if not s.startswith("2"))
+            total_requests += len(ordered)
+            total_errors += errors
+            endpoints[endpoint] = {
+                "requests": len(ordered),
+                "errors": errors,
+                "statuses": statuses,
+                "p50_ms": round(percentile(ordered, 50), 1),
+                "p95_ms": round(percentile(ordered, 95), 1),
+                "p99_ms": round(percentile(ordered, 99), 1),
+            }
+        lag = sorted(self.loop_lag_ms)
+        return {
+            "sessions": self.sessions,
+            "requests": total_requests,
+            "errors": total_errors,
+            "throughput_rps": round(total_requests / wall_s, 2) if wall_s else 0.0,
+            "loop_lag_ms": {
+                "p50": round(percentile(lag, 50), 2),
+                "p99": round(percentile(lag, 99), 2),
+                "max": round(lag[-1], 2) if lag else 0.0,
+                "mean": round(statistics.fmean(lag), 2) if lag else 0.0,
+            },
+            "endpoints": endpoints,
+        }
+
+
+def make_cv(kind: str, rng: random.Random) -> tuple[str, bytes, str]:
+    """A unique CV per session so the OCR cache does not hide extraction cost."""
+
+    if kind == "mixed":
+        kind = rng.choice(["docx", "png"])
+    if kind == "png":
+        return "cv.png", b"\x89PNG\r\n\x1a\n" + rng.randbytes(50_000), "image/png"
+
+    from docx import Document
+
+    doc = Document()
+    doc.add_heading(f"Nguyễn Văn {rng.randint(1, 10**9)}", level=1)
+    doc.add_paragraph("Software Engineer - Python, Docker, SQL, React, Git")
+    for _ in range(20):
+        doc.add_paragraph("Phát triển và vận hành dịch vụ backend cho hệ thống thương mại điện tử.")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return "cv.docx", buffer.getvalue(), DOCX_MIME_TYPE
+
+
+def make_answer_audio(rng: random.Random) -> bytes:
+    # WebM/EBML magic followed by noise; the fake STT does not decode it
+    return b"\x1aE\xdf\xa3" + rng.randbytes(24_000)
+
+
+async def timed(stats: LevelStats, endpoint: str, request) -> httpx.Response | None:
+    started = time.perf_counter()
+    try:
+        response = await request
+    except httpx.HTTPError as e:
+        stats.record(endpoint, (time.perf_counter() - started) * 1000, type(e).__name__)
+        return None
+    stats.record(endpoint, (time.perf_counter() - started) * 1000, response.status_code)
+    return response
+
+
+async def run_session(client: httpx.AsyncClient, stats: LevelStats, args, rng: random.Random):
+    filename, content, mime_type = make_cv(args.cv_kind, rng)
+    response = await timed(stats, "upload-cv", client.post(
+        "/api/upload-cv", files={"file": (filename, content, mime_type)}
+    ))
+    cv_text = response.json().get("cv_text", "") if response is not None and response.status_code == 200 else ""
+
+    await timed(stats, "analyze-cv", client.post(
+        "/api/analyze-cv", json={"cv_text": cv_text or "Python developer", "role": "Backend Developer"}
+    ))
+
+    response = await timed(stats, "generate-questions", client.post(
+        "/api/generate-questions",
+        json={"field": "IT", "role": "Backend Developer", "skills": ["python", "docker"]},
+    ))
+    questions = []
+    if response is not None and response.status_code == 200:
+        questions = response.json().get("questions") or []
+    questions = questions or ["[Background] Hãy giới thiệu về bản thân."]
+
+    for index in range(args.answers):
+        question = questions[index % len(questions)]
+        await timed(stats, "text-to-speech", client.post(
+            "/api/text-to-speech", json={"text": question, "language": "vi-VN"}
+        ))
+        response = await timed(stats, "process-voice", client.post(
+            "/api/process-voice",
+            files={"audio": ("answer.webm", make_answer_audio(rng), "audio/webm")},
+            data={"language": "vi-VN"},
+        ))
+        transcript = ""
+        if response is not None and response.status_code == 200:
+            transcript = response.json().get("transcription", "")
+        await timed(stats, "gemini", client.post(
+            "/api/gemini", json={"prompt": transcript or "Tôi không chắc."}
+        ))
+
+    stats.sessions += 1
+
+
+async def monitor_loop_lag(stats: LevelStats, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        stats.loop_lag_ms.append(max(0.0, (time.perf_counter() - started - interval) * 1000))
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, args) -> dict:
+    stats = LevelStats()
+    stop = asyncio.Event()
+    deadline = time.perf_counter() + args.duration
+
+    async def user(user_id: int):
+        rng = random.Random(args.seed * 1000 + user_id)
+        while time.perf_counter() < deadline:
+            await run_session(client, stats, args, rng)
+
+    monitor = asyncio.create_task(monitor_loop_lag(stats, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    wall_s = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    summary = stats.summary(wall_s)
+    summary["concurrency"] = concurrency
+    summary["wall_s"] = round(wall_s, 2)
+    return summary
+
+
+def find_saturation(levels: list[dict], min_gain: float) -> int | None:
+    """Last concurrency level that still raised throughput by ``min_gain``."""
+
+    best = None
+    previous = None
+    for level in levels:
+        if previous is not None and level["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            return previous["concurrency"]
+        best = previous = level
+    return best["concurrency"] if best else None
+
+
+def print_level(level: dict):
+    lag = level["loop_lag_ms"]
+    print(
+        f"\n== concurrency {level['concurrency']}: {level['sessions']} sessions, "
+        f"{level['requests']} requests, {level['errors']} errors, "
+        f"{level['throughput_rps']} req/s, loop lag p99 {lag['p99']} ms (max {lag['max']} ms)"
+    )
+    for endpoint, data in level["endpoints"].items():
+        print(
+            f"  {endpoint:<20} n={data['requests']:<6} err={data['errors']:<5}"
+            f" p50={data['p50_ms']:>8} p95={data['p95_ms']:>8} p99={data['p99_ms']:>8} ms"
+        )
+
+
+async def main_async(args) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+    else:
+        import main as backend_main
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=backend_main.app),
+            base_url="http://loadgen",
+            timeout=args.timeout,
+        )
+
+    levels = []
+    async with client:
+        for concurrency in args.concurrency:
+            level = await run_level(client, concurrency, args)
+            print_level(level)
+            levels.append(level)
+
+    saturation = find_saturation(levels, args.saturation_gain)
+    print(f"\nSaturation point: ~{saturation} concurrent sessions")
+    return {
+        "benchmark": "loadgen",
+        "commit": git_commit(),
+        "target": args.base_url or "in-process",
+        "provider_mode": os.getenv("PROVIDER_MODE", "google"),
+        "duration_s": args.duration,
+        "answers_per_session": args.answers,
+        "saturation_concurrency": saturation,
+        "levels": levels,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the backend session flow")
+    parser.add_argument("--base-url", default=None,
+                        help="target server; default runs the app in-process with fake providers")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per level")
+    parser.add_argument("--answers", type=int, default=3, help="voice answers per session")
+    parser.add_argument("--cv-kind", choices=["docx", "png", "mixed"], default="mixed")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--saturation-gain", type=float, default=0.10)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    if not args.base_url:
+        os.environ.setdefault("PROVIDER_MODE", "fake")
+
+    report = asyncio.run(main_async(args))
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"loadgen-{stamp}-{report['commit']}.json"
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# bench/synth.py
+
+"""Seeded generators for synthetic job listings and recommendation queries.
+
+The shape mirrors job_data.json (job_name, company_name, job_url,
+job_description, job_requirement). Skill popularity follows a Zipf-like
+distribution so a few skills appear in most jobs and the long tail rarely,
+which is what the real feed looks like.
+
+    python -m bench.synth --jobs 10000 --seed 42 --output /tmp/jobs.json
+"""
+
+import argparse
+import json
+import random
+
+SKILLS = [
+    "python", "java", "javascript", "sql", "git", "react", "docker", "aws",
+    "typescript", "nodejs", "c#", ".net", "kubernetes", "angular", "vue",
+    "mongodb", "azure", "golang", "c++", "flutter", "swift", "rust",
+    "spring", "django", "fastapi", "redis", "kafka", "postgresql", "mysql",
+    "linux", "terraform", "graphql", "php", "laravel", "kotlin", "android",
+    "ios", "figma", "excel", "power bi", "tableau", "spark", "hadoop",
+    "pytorch", "tensorflow", "pandas", "selenium", "jira", "scrum", "ci/cd",
+]
+
+ROLES = [
+    "Backend Developer", "Frontend Developer", "Fullstack Developer",
+    "Software Engineer", "Data Engineer", "Data Analyst", "DevOps Engineer",
+    "Mobile Developer", "QA Engineer", "Business Analyst", "Product Manager",
+    "Machine Learning Engineer", "System Administrator", "UI/UX Designer",
+    "Lập trình viên Backend", "Kỹ sư phần mềm", "Chuyên viên phân tích dữ liệu",
+]
+
+LEVELS = ["", "", "Junior ", "Senior ", "Mid-level ", "Fresher ", "Lead "]
+
+COMPANIES = [
+    "FPT Software", "Viettel", "VNG", "Tiki", "MoMo", "Shopee", "Grab",
+    "KMS Technology", "NashTech", "TMA Solutions", "Axon", "Zalo",
+]
+
+FILLER = [
+    "Tham gia phát triển và bảo trì hệ thống cho khách hàng trong và ngoài nước.",
+    "Phối hợp với các nhóm sản phẩm để phân tích yêu cầu và đề xuất giải pháp.",
+    "Work closely with product owners to deliver high quality features.",
+    "Viết tài liệu kỹ thuật, review code và hỗ trợ các thành viên trong nhóm.",
+    "Design, build and maintain scalable services used by millions of users.",
+    "Tối ưu hiệu năng và đảm bảo chất lượng sản phẩm trước khi phát hành.",
+    "Participate in agile ceremonies and continuously improve our processes.",
+    "Có khả năng làm việc độc lập và làm việc nhóm, chịu được áp lực cao.",
+    "Ưu tiên ứng viên có kinh nghiệm làm việc với hệ thống phân tán.",
+    "Good communication skills in English is a plus.",
+]
+
+# Zipf-like weights: skill i is picked with probability ~ 1 / (i + 1)
+SKILL_WEIGHTS = [1.0 / (rank + 1) for rank in range(len(SKILLS))]
+
+
+def _pick_skills(rng: random.Random, count: int) -> list[str]:
+    picked = set()
+    while len(picked) < count:
+        picked.add(rng.choices(SKILLS, weights=SKILL_WEIGHTS)[0])
+    return sorted(picked)
+
+
+def _paragraph(rng: random.Random, min_chars: int, max_chars: int, skills: list[str]) -> str:
+    target = rng.randint(min_chars, max_chars)
+    parts = []
+    length = 0
+    while length < target:
+        sentence = rng.choice(FILLER)
+        if skills and rng.random() < 0.4:
+            sentence += f" Sử dụng {rng.choice(skills)} hằng ngày."
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)
+
+
+def generate_job(rng: random.Random, job_id: int) -> dict:
+    skills = _pick_skills(rng, rng.randint(2, 8))
+    role = rng.choice(ROLES)
+    requirement = (
+        f"Kinh nghiệm với {', '.join(skills)}. "
+        + _paragraph(rng, 150, 900, skills)
+    )
+    return {
+        "job_name": f"{rng.choice(LEVELS)}{role}",
+        "company_name": rng.choice(COMPANIES),
+        "job_url": f"https://example.com/jobs/{job_id}",
+        "job_description": _paragraph(rng, 300, 2000, skills),
+        "job_requirement": requirement,
+    }
+
+
+def generate_jobs(count: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    return [generate_job(rng, job_id) for job_id in range(count)]
+
+
+def generate_queries(count: int, seed: int = 42, skill_counts: tuple[int, ...] = (1, 3, 5, 10)) -> list[dict]:
+    """Query mix cycling through ``skill_counts``; 80% carry a target role."""
+
+    rng = random.Random(seed + 1)
+    queries = []
+    for index in range(count):
+        role = rng.choice(ROLES).lower() if rng.random() < 0.8 else ""
+        queries.append({
+            "role": role,
+            "skills": _pick_skills(rng, skill_counts[index % len(skill_counts)]),
+            "experience_years": rng.randint(0, 8),
+        })
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic job_data.json")
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(generate_jobs(args.jobs, args.seed), f, ensure_ascii=False)
+    print(f"Wrote {args.jobs} jobs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
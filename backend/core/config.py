@@ -128,12 +128,112 @@ safety_settings = [
     {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
 ]
 
+GEMINI_MODEL_NAME = "gemini-2.5-flash-lite"
+
 GEMINI_MODEL = (
     genai.GenerativeModel(
-        "gemini-2.5-flash-lite",
+        GEMINI_MODEL_NAME,
         generation_config=generation_config,
         safety_settings=safety_settings,
     )
     if GOOGLE_API_KEY
     else None
-)
\ No newline at end of file
+)
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer env var, falling back to ``default`` on bad input."""
+
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Warning: env var {name}={value!r} is not an integer, using {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float env var, falling back to ``default`` on bad input."""
+
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        print(f"Warning: env var {name}={value!r} is not a number, using {default}")
+        return default
+
+
+# OCR (Google Vision) limits
+# Vision only accepts up to 5 pages per inline batch_annotate_files request.
+OCR_PAGES_PER_REQUEST = max(1, min(_env_int("OCR_PAGES_PER_REQUEST", 5), 5))
+# Pages beyond this budget are skipped so huge uploads cannot monopolize workers.
+OCR_MAX_PAGES = max(1, _env_int("OCR_MAX_PAGES", 20))
+# Max concurrent Vision calls across all requests in this process.
+OCR_CONCURRENCY = max(1, _env_int("OCR_CONCURRENCY", 4))
+# A PDF page whose text layer has fewer characters than this is treated as
+# scanned and routed to Vision OCR.
+PDF_TEXT_MIN_CHARS = max(0, _env_int("PDF_TEXT_MIN_CHARS", 20))
+
+# Persistent cache of extracted CV text (sqlite file, LRU-evicted by size).
+OCR_CACHE_DIR = Path(os.getenv("OCR_CACHE_DIR") or BACKEND_DIR / ".cache" / "ocr")
+# Set to 0 to disable the cache.
+OCR_CACHE_MAX_BYTES = max(0, _env_int("OCR_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Upload limits (bytes), enforced before the form is parsed. Uploads above
+# UPLOAD_SPOOL_BYTES are memory-mapped from Starlette's spooled temp file.
+MAX_CV_UPLOAD_BYTES = max(1, _env_int("MAX_CV_UPLOAD_BYTES", 10 * 1024 * 1024))
+MAX_AUDIO_UPLOAD_BYTES = max(1, _env_int("MAX_AUDIO_UPLOAD_BYTES", 10 * 1024 * 1024))
+UPLOAD_SPOOL_BYTES = max(0, _env_int("UPLOAD_SPOOL_BYTES", 1024 * 1024))
+
+# "google" talks to the real Google services, "fake" uses core/fake_providers.py
+# (offline load testing).
+PROVIDER_MODE = os.getenv("PROVIDER_MODE", "google").strip().lower()
+
+# Shared secret for /api/admin/* (sent as the X-Admin-Token header).
+# When unset the admin endpoints are disabled.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+
+# Sampling profiler (core/profiler.py). Off by default; can also be started
+# at runtime through POST /api/admin/profiler/start.
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "").strip().lower() in {"1", "true", "yes", "on"}
+# Comma-separated path prefixes to sample, e.g. "/api/recommend-jobs,/api/generate-cv-docx".
+# Empty means every /api route.
+PROFILER_ROUTES = [r.strip() for r in os.getenv("PROFILER_ROUTES", "").split(",") if r.strip()]
+# Fraction of matching requests that are sampled.
+PROFILER_SAMPLE_RATE = max(0.0, min(_env_float("PROFILER_SAMPLE_RATE", 0.1), 1.0))
+# Stack sampling interval while a sampled request is in flight.
+PROFILER_INTERVAL_MS = max(1, _env_int("PROFILER_INTERVAL_MS", 5))
+# Synchronous work holding the event loop longer than this is reported.
+PROFILER_BLOCK_THRESHOLD_MS = max(10, _env_int("PROFILER_BLOCK_THRESHOLD_MS", 100))
+
+# Job recommendation ranking: "rule" (keyword rules only), "tfidf" (cosine
+# similarity on the sparse index in core/job_index.py) or "hybrid" (rule
+# score blended with the similarity). Requests may override it with "mode".
+JOB_MATCHING_MODES = ("rule", "tfidf", "hybrid")
+JOB_MATCHING_MODE = os.getenv("JOB_MATCHING_MODE", "rule").strip().lower()
+if JOB_MATCHING_MODE not in JOB_MATCHING_MODES:
+    print(f"Warning: env var JOB_MATCHING_MODE={JOB_MATCHING_MODE!r} is not one of {JOB_MATCHING_MODES}, using 'rule'")
+    JOB_MATCHING_MODE = "rule"
+# Share of the similarity in the hybrid score (0 = rule only, 1 = tfidf only).
+JOB_SEMANTIC_WEIGHT = max(0.0, min(_env_float("JOB_SEMANTIC_WEIGHT", 0.5), 1.0))
+# Candidates fetched from the index before rule re-scoring in hybrid mode.
+JOB_SEMANTIC_CANDIDATES = max(1, _env_int("JOB_SEMANTIC_CANDIDATES", 100))
+
+# Interview sessions (core/interview_sessions.py): TTS for the next questions
+# is synthesized in the background and kept in memory.
+INTERVIEW_SESSION_TTL_S = max(60, _env_int("INTERVIEW_SESSION_TTL_S", 15 * 60))
+INTERVIEW_MAX_SESSIONS = max(1, _env_int("INTERVIEW_MAX_SESSIONS", 500))
+# Total audio kept across all sessions; older/already asked audio is dropped first.
+INTERVIEW_AUDIO_MAX_BYTES = max(0, _env_int("INTERVIEW_AUDIO_MAX_BYTES", 64 * 1024 * 1024))
+# How many questions ahead of the current one are synthesized.
+INTERVIEW_PREFETCH_DEPTH = max(0, _env_int("INTERVIEW_PREFETCH_DEPTH", 2))
+# Max concurrent background TTS calls across all sessions.
+INTERVIEW_PREFETCH_CONCURRENCY = max(1, _env_int("INTERVIEW_PREFETCH_CONCURRENCY", 4))
+
+# Gemini prompt templates (core/prompts.py). Upper bound on the estimated
+# input tokens of one request; oversized user input (e.g. cv_text) is cut
+# to fit. Templates may use a lower budget of their own.
+PROMPT_MAX_INPUT_TOKENS = max(500, _env_int("PROMPT_MAX_INPUT_TOKENS", 8000))
@@ -0,0 +1,123 @@
+# core/extraction.py
+
+"""CV text extraction: local parsing first, Vision OCR only when needed.
+
+- DOCX is read with python-docx (Vision cannot read DOCX at all).
+- PDF pages with a usable text layer are read with pypdf; only pages that
+  look scanned are sent to Vision, so a mixed PDF is routed page by page.
+- Images (and TIFF/GIF) always go to Vision.
+"""
+
+import io
+import time
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from fastapi.concurrency import run_in_threadpool
+
+from core.config import OCR_MAX_PAGES, PDF_TEXT_MIN_CHARS
+from core.log import get_logger
+from core.ocr import OcrResult, PageText, ocr_file
+from core.uploads import DOCX_MIME_TYPE
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf missing: every PDF page goes through Vision
+    PdfReader = None
+
+logger = get_logger(__name__)
+
+PDF_MIME_TYPE = "application/pdf"
+
+# Part of the OCR cache key: bump the version whenever extraction output changes.
+EXTRACTION_MODE = f"extract-v2:max{OCR_MAX_PAGES}:min{PDF_TEXT_MIN_CHARS}:pypdf{int(PdfReader is not None)}"
+
+
+def _extract_docx(content: bytes | memoryview) -> OcrResult:
+    started = time.perf_counter()
+    doc = Document(io.BytesIO(content))
+
+    # Walk the body in document order so table-layout CVs keep their sections
+    lines = []
+    for child in doc.element.body.iterchildren():
+        if child.tag == qn("w:p"):
+            text = Paragraph(child, doc).text
+            if text.strip():
+                lines.append(text)
+        elif child.tag == qn("w:tbl"):
+            for row in Table(child, doc).rows:
+                cells = []
+                seen = set()
+                for cell in row.cells:
+                    # Merged cells are repeated by python-docx (same <w:tc>)
+                    if cell._tc in seen:
+                        continue
+                    seen.add(cell._tc)
+                    if cell.text.strip():
+                        cells.append(cell.text)
+                if cells:
+                    lines.append(" | ".join(cells))
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    page = PageText(page=1, text="\n".join(lines), elapsed_ms=elapsed_ms, source="text")
+    return OcrResult(pages=[page], total_pages=1)
+
+
+def _extract_pdf_text_layer(content: bytes | memoryview, max_pages: int) -> tuple[int, list[PageText]]:
+    """Return (total_pages, pages with a text layer, up to ``max_pages``)."""
+
+    reader = PdfReader(io.BytesIO(content))
+    total_pages = len(reader.pages)
+
+    pages = []
+    for number, pdf_page in enumerate(reader.pages[:max_pages], start=1):
+        started = time.perf_counter()
+        try:
+            text = pdf_page.extract_text() or ""
+        except Exception as e:
+            logger.warning("pdf_text_layer_error", extra={"page": number, "error": str(e)})
+            text = ""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        pages.append(PageText(page=number, text=text.strip(), elapsed_ms=elapsed_ms, source="text"))
+
+    return total_pages, pages
+
+
+async def _extract_pdf(content: bytes | memoryview, max_pages: int) -> OcrResult:
+    if PdfReader is None:
+        return await ocr_file(content, PDF_MIME_TYPE, max_pages=max_pages)
+
+    try:
+        total_pages, pages = await run_in_threadpool(_extract_pdf_text_layer, content, max_pages)
+    except Exception as e:
+        logger.warning("pdf_parse_failed", extra={"error": str(e)})
+        return await ocr_file(content, PDF_MIME_TYPE, max_pages=max_pages)
+
+    text_pages = [p for p in pages if len("".join(p.text.split())) >= PDF_TEXT_MIN_CHARS]
+    scanned = sorted({p.page for p in pages} - {p.page for p in text_pages})
+    logger.info("pdf_routing", extra={"text_pages": len(text_pages), "scanned_pages": len(scanned)})
+
+    result = OcrResult(pages=text_pages, total_pages=total_pages)
+    if scanned:
+        ocr_result = await ocr_file(content, PDF_MIME_TYPE, pages=scanned, max_pages=max_pages)
+        result.pages.extend(ocr_result.pages)
+
+    result.skipped_pages = max(0, total_pages - max_pages)
+    return result
+
+
+async def extract_cv_text(content: bytes | memoryview, mime_type: str, max_pages: int = OCR_MAX_PAGES) -> OcrResult:
+    """Extract CV text, using local parsers where possible.
+
+    Raises the same errors as ``ocr_file`` when Vision is needed.
+    """
+
+    if mime_type == DOCX_MIME_TYPE:
+        return await run_in_threadpool(_extract_docx, content)
+
+    if mime_type == PDF_MIME_TYPE:
+        return await _extract_pdf(content, max_pages)
+
+    return await ocr_file(content, mime_type, max_pages=max_pages)
@@ -0,0 +1,242 @@
+# core/fake_providers.py
+
+"""Local stand-ins for Gemini, Vision, Speech-to-Text and Text-to-Speech.
+
+Selected with ``PROVIDER_MODE=fake`` (see core/providers.py) so the backend
+can be load-tested offline. Each fake mimics the async method the endpoints
+call and returns the real response types. Behaviour is configured through
+env vars, globally or per provider (GEMINI, VISION, SPEECH, TTS):
+
+    FAKE_LATENCY_MS         median latency (lognormal)        default 150
+    FAKE_LATENCY_SIGMA      lognormal sigma (spread)          default 0.4
+    FAKE_ERROR_RATE         fraction of calls raising 503     default 0
+    FAKE_RATE_LIMIT_RATE    fraction of calls raising 429     default 0
+    FAKE_MALFORMED_RATE     fraction of malformed outputs     default 0
+    FAKE_SEED               RNG seed                          default unset
+    FAKE_VISION_TOTAL_PAGES pages reported for PDF/TIFF files default 2
+
+e.g. ``FAKE_GEMINI_LATENCY_MS=1200 FAKE_GEMINI_RATE_LIMIT_RATE=0.05``.
+"""
+
+import asyncio
+import json
+import os
+import random
+from dataclasses import dataclass
+
+from google.api_core import exceptions
+from google.cloud import speech, texttospeech, vision
+
+from core.config import _env_float
+
+_seed = os.getenv("FAKE_SEED")
+_rng = random.Random(int(_seed) if _seed else None)
+
+
+@dataclass
+class FakeBehavior:
+    latency_ms: float = 150.0
+    latency_sigma: float = 0.4
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    malformed_rate: float = 0.0
+
+    @classmethod
+    def from_env(cls, provider: str) -> "FakeBehavior":
+        def value(field: str, default: float) -> float:
+            shared = _env_float(f"FAKE_{field}", default)
+            return _env_float(f"FAKE_{provider}_{field}", shared)
+
+        return cls(
+            latency_ms=value("LATENCY_MS", cls.latency_ms),
+            latency_sigma=value("LATENCY_SIGMA", cls.latency_sigma),
+            error_rate=value("ERROR_RATE", cls.error_rate),
+            rate_limit_rate=value("RATE_LIMIT_RATE", cls.rate_limit_rate),
+            malformed_rate=value("MALFORMED_RATE", cls.malformed_rate),
+        )
+
+    async def simulate(self) -> bool:
+        """Sleep, maybe raise, and return True when the output should be malformed."""
+
+        delay_ms = self.latency_ms * _rng.lognormvariate(0, self.latency_sigma)
+        await asyncio.sleep(delay_ms / 1000)
+
+        roll = _rng.random()
+        if roll < self.rate_limit_rate:
+            raise exceptions.ResourceExhausted("429 Quota exceeded (fake provider)")
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise exceptions.ServiceUnavailable("503 Service unavailable (fake provider)")
+        return _rng.random() < self.malformed_rate
+
+
+# --- Gemini ---
+
+FAKE_ANALYSIS = {
+    "extracted_role": "Kỹ sư phần mềm",
+    "skills": ["python", "docker", "sql", "react", "git"],
+    "experience_years": "3 năm",
+    "experience_summary": "Ba năm phát triển backend và frontend cho các sản phẩm web.",
+    "education": "Cử nhân Khoa học Máy tính",
+    "strengths": ["Nền tảng lập trình vững", "Kinh nghiệm làm việc nhóm"],
+    "weaknesses": ["Ít kinh nghiệm với hệ thống phân tán"],
+    "learning_path": {
+        "immediate": ["kubernetes"],
+        "short_term": ["aws"],
+        "long_term": ["kiến trúc hệ thống"],
+    },
+    "recommended_tasks": ["Xây dựng một dự án cá nhân triển khai trên cloud"],
+}
+
+FAKE_QUESTIONS = [
+    "[Background] Hãy giới thiệu về kinh nghiệm làm việc của bạn.",
+    "[Situation] Mô tả một lần bạn phải xử lý hạn chót gấp.",
+    "[Technical] Giải thích sự khác nhau giữa process và thread.",
+    "[Technical] Bạn sẽ thiết kế một REST API phân trang như thế nào?",
+    "[Situation] Kể về một xung đột trong nhóm và cách bạn giải quyết.",
+]
+
+FAKE_EVALUATION = {
+    "type": "evaluation",
+    "feedback": "Câu trả lời rõ ràng, nên bổ sung số liệu cụ thể.",
+    "suggested_answer": "Trong dự án gần nhất, tôi đã giảm 30% thời gian phản hồi bằng cách thêm cache.",
+}
+
+FAKE_CV = """# [Your Full Name]
+[Email] | [Phone]
+
+## Professional Summary
+Software engineer with three years of experience building web services.
+
+## Skills
+Python, Docker, SQL, React, Git
+"""
+
+
+class FakeUsageMetadata:
+    def __init__(self, prompt: str, text: str):
+        # Rough 4 characters per token, like the real tokenizer on mixed text
+        self.prompt_token_count = max(1, len(prompt) // 4)
+        self.candidates_token_count = max(1, len(text) // 4)
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class FakeGeminiResponse:
+    def __init__(self, prompt: str, text: str):
+        self.text = text
+        self.usage_metadata = FakeUsageMetadata(prompt, text)
+
+
+class FakeGeminiModel:
+    """Answers ``generate_content_async`` with canned output picked from the prompt."""
+
+    def __init__(self, behavior: FakeBehavior | None = None,
+                 system_instruction: str | None = None,
+                 generation_config: dict | None = None):
+        self.behavior = behavior or FakeBehavior.from_env("GEMINI")
+        self.system_instruction = system_instruction
+        self.generation_config = generation_config or {}
+
+    def _canned(self, prompt: str) -> str:
+        # Templates carry their instructions in the system instruction
+        prompt = self.system_instruction or prompt
+        if "sơ yếu lý lịch" in prompt:
+            data = FAKE_ANALYSIS
+        elif "câu hỏi phỏng vấn" in prompt:
+            data = FAKE_QUESTIONS
+        elif "huấn luyện viên phỏng vấn" in prompt:
+            data = FAKE_EVALUATION
+        else:
+            return FAKE_CV
+        body = json.dumps(data, ensure_ascii=False, indent=2)
+        if self.generation_config.get("response_mime_type") == "application/json":
+            # JSON mode answers with the bare document
+            return body
+        # Otherwise Gemini fences JSON answers in ```json blocks, so do the same
+        return f"```json\n{body}\n```"
+
+    async def generate_content_async(self, contents, **kwargs) -> FakeGeminiResponse:
+        prompt = contents if isinstance(contents, str) else json.dumps(contents, default=str)
+        malformed = await self.behavior.simulate()
+        text = self._canned(prompt)
+        if malformed:
+            # Truncated output, the most common real-world failure
+            text = text[: len(text) // 2]
+        # The system instruction is billed as input too
+        return FakeGeminiResponse((self.system_instruction or "") + prompt, text)
+
+
+# --- Vision ---
+
+def _fake_page_text(page: int) -> str:
+    return (
+        f"Trang {page}\nNguyễn Văn A - Software Engineer\n"
+        "Kỹ năng: Python, Docker, SQL, React, Git\n"
+        "Kinh nghiệm: 3 năm phát triển backend tại công ty ABC."
+    )
+
+
+class FakeVisionClient:
+    def __init__(self, behavior: FakeBehavior | None = None, total_pages: int = 2):
+        self.behavior = behavior or FakeBehavior.from_env("VISION")
+        self.total_pages = int(_env_float("FAKE_VISION_TOTAL_PAGES", total_pages))
+
+    async def batch_annotate_files(self, requests, **kwargs) -> vision.BatchAnnotateFilesResponse:
+        file_responses = []
+        for request in requests:
+            malformed = await self.behavior.simulate()
+            pages = list(request.pages) or list(range(1, min(self.total_pages, 5) + 1))
+            page_responses = [
+                vision.AnnotateImageResponse(
+                    full_text_annotation=vision.TextAnnotation(
+                        text="" if malformed else _fake_page_text(page)
+                    ),
+                    context=vision.ImageAnnotationContext(page_number=page),
+                )
+                for page in pages
+                if page <= self.total_pages
+            ]
+            file_responses.append(vision.AnnotateFileResponse(
+                responses=page_responses, total_pages=self.total_pages
+            ))
+        return vision.BatchAnnotateFilesResponse(responses=file_responses)
+
+    async def batch_annotate_images(self, requests, **kwargs) -> vision.BatchAnnotateImagesResponse:
+        responses = []
+        for _ in requests:
+            malformed = await self.behavior.simulate()
+            responses.append(vision.AnnotateImageResponse(
+                full_text_annotation=vision.TextAnnotation(text="" if malformed else _fake_page_text(1))
+            ))
+        return vision.BatchAnnotateImagesResponse(responses=responses)
+
+
+# --- Speech-to-Text / Text-to-Speech ---
+
+class FakeSpeechClient:
+    def __init__(self, behavior: FakeBehavior | None = None):
+        self.behavior = behavior or FakeBehavior.from_env("SPEECH")
+
+    async def recognize(self, config=None, audio=None, **kwargs) -> speech.RecognizeResponse:
+        malformed = await self.behavior.simulate()
+        if malformed:
+            return speech.RecognizeResponse(results=[])
+        transcript = "Tôi có ba năm kinh nghiệm phát triển backend với Python và Docker."
+        return speech.RecognizeResponse(results=[
+            speech.SpeechRecognitionResult(alternatives=[
+                speech.SpeechRecognitionAlternative(transcript=transcript, confidence=0.92)
+            ])
+        ])
+
+
+class FakeTextToSpeechClient:
+    # ~ 1 KB of MP3 per 10 characters of text at the configured speaking rate
+    BYTES_PER_CHAR = 100
+
+    def __init__(self, behavior: FakeBehavior | None = None):
+        self.behavior = behavior or FakeBehavior.from_env("TTS")
+
+    async def synthesize_speech(self, input=None, voice=None, audio_config=None, **kwargs):
+        malformed = await self.behavior.simulate()
+        text = input.text if input is not None else ""
+        size = 0 if malformed else max(1, len(text)) * self.BYTES_PER_CHAR
+        return texttospeech.SynthesizeSpeechResponse(audio_content=b"\xff\xfb" + b"\x00" * size)
@@ -0,0 +1,294 @@
+# core/interview_sessions.py
+
+"""In-memory interview sessions with TTS prefetch.
+
+A session holds the ordered questions of one InterviewWarmup run. When
+question N is requested, the audio for questions N+1..N+depth is
+synthesized in the background (at most ``concurrency`` prefetches at a
+time across all sessions), so moving to the next question is served from
+memory. The question the user is waiting for is never queued behind
+prefetches: if its prefetch has not started yet it is cancelled and
+synthesized directly.
+
+Sessions expire after ``idle_ttl_s`` without access. The audio of all
+sessions together stays under ``max_audio_bytes``: already asked
+questions go first, then the audio of the least recently used sessions.
+Dropped audio is synthesized again on demand.
+"""
+
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from core.config import (
+    INTERVIEW_AUDIO_MAX_BYTES,
+    INTERVIEW_MAX_SESSIONS,
+    INTERVIEW_PREFETCH_CONCURRENCY,
+    INTERVIEW_PREFETCH_DEPTH,
+    INTERVIEW_SESSION_TTL_S,
+)
+from core.log import get_logger
+from core.metrics import CACHE_LOOKUPS
+from core.tts import synthesize_speech
+
+logger = get_logger(__name__)
+
+Synthesizer = Callable[[str, str], Awaitable[bytes]]
+
+
+class SessionNotFound(KeyError):
+    pass
+
+
+@dataclass
+class InterviewSession:
+    id: str
+    questions: list[str]
+    language: str
+    last_access: float
+    current: int = 0
+    closed: bool = False
+    audio: dict[int, bytes] = field(default_factory=dict)
+    tasks: dict[int, asyncio.Task] = field(default_factory=dict)
+    # Indexes whose task in ``tasks`` is a background prefetch
+    prefetching: set[int] = field(default_factory=set)
+    # Indexes whose synthesis is running (past the prefetch semaphore)
+    running: set[int] = field(default_factory=set)
+    errors: dict[int, str] = field(default_factory=dict)
+
+    @property
+    def audio_bytes(self) -> int:
+        return sum(len(a) for a in self.audio.values())
+
+    def status(self) -> dict:
+        return {
+            "session_id": self.id,
+            "questions": len(self.questions),
+            "language": self.language,
+            "current": self.current,
+            "ready": sorted(self.audio),
+            "pending": sorted(self.tasks),
+            "audio_bytes": self.audio_bytes,
+        }
+
+
+class InterviewSessionStore:
+    def __init__(self, synthesize: Synthesizer = synthesize_speech,
+                 max_sessions: int = INTERVIEW_MAX_SESSIONS,
+                 max_audio_bytes: int = INTERVIEW_AUDIO_MAX_BYTES,
+                 idle_ttl_s: float = INTERVIEW_SESSION_TTL_S,
+                 prefetch_depth: int = INTERVIEW_PREFETCH_DEPTH,
+                 concurrency: int = INTERVIEW_PREFETCH_CONCURRENCY):
+        self.synthesize = synthesize
+        self.max_sessions = max_sessions
+        self.max_audio_bytes = max_audio_bytes
+        self.idle_ttl_s = idle_ttl_s
+        self.prefetch_depth = prefetch_depth
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Least recently used first
+        self._sessions: OrderedDict[str, InterviewSession] = OrderedDict()
+        self.audio_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.evicted_bytes = 0
+        self.expired = 0
+
+    # --- sessions ---
+
+    def create(self, questions: list[str], language: str) -> InterviewSession:
+        """Create a session and start synthesizing its first questions (call on the loop)."""
+
+        self._sweep()
+        while len(self._sessions) >= self.max_sessions:
+            _, oldest = self._sessions.popitem(last=False)
+            self._close(oldest)
+
+        session = InterviewSession(
+            id=secrets.token_urlsafe(16),
+            questions=list(questions),
+            language=language,
+            last_access=time.monotonic(),
+        )
+        self._sessions[session.id] = session
+        self._prefetch(session, 0, self.prefetch_depth + 1)
+        return session
+
+    def get(self, session_id: str) -> InterviewSession:
+        self._sweep()
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise SessionNotFound(session_id)
+        session.last_access = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def close(self, session_id: str) -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self._close(session)
+        return True
+
+    def _close(self, session: InterviewSession) -> None:
+        session.closed = True
+        for task in session.tasks.values():
+            task.cancel()
+        session.tasks.clear()
+        session.prefetching.clear()
+        self.audio_bytes -= session.audio_bytes
+        session.audio.clear()
+
+    def _sweep(self) -> None:
+        deadline = time.monotonic() - self.idle_ttl_s
+        # OrderedDict is in access order, so stop at the first live session
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_access >= deadline:
+                break
+            self._sessions.popitem(last=False)
+            self._close(session)
+            self.expired += 1
+
+    # --- audio ---
+
+    async def audio(self, session: InterviewSession, index: int) -> tuple[bytes, bool]:
+        """(MP3 bytes, served from memory) for question ``index``; prefetches the next ones."""
+
+        if not 0 <= index < len(session.questions):
+            raise IndexError(index)
+        session.current = index
+        self._prefetch(session, index + 1, self.prefetch_depth)
+
+        audio = session.audio.get(index)
+        if audio is not None:
+            self.hits += 1
+            CACHE_LOOKUPS.inc(cache="interview_audio", result="hit")
+            return audio, True
+        self.misses += 1
+        CACHE_LOOKUPS.inc(cache="interview_audio", result="miss")
+
+        task = session.tasks.get(index)
+        if task is not None and index in session.prefetching and index not in session.running:
+            # A prefetch still queued behind others; the user is waiting now.
+            # Direct tasks (another request for the same question) are shared.
+            task.cancel()
+            task = None
+        if task is None:
+            task = self._schedule(session, index, prefetch=False)
+        # Shield so a client disconnect does not throw away the synthesis
+        try:
+            audio = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            # The session was closed or expired while we waited
+            raise SessionNotFound(session.id)
+
+        # Use the task's result, not session.audio: the cap may already have
+        # dropped it again if the client moved on while we waited
+        if audio is None:
+            raise RuntimeError(session.errors.get(index, "speech synthesis failed"))
+        return audio, False
+
+    def _prefetch(self, session: InterviewSession, start: int, count: int) -> None:
+        for index in range(start, min(start + count, len(session.questions))):
+            if index not in session.audio and index not in session.tasks:
+                self._schedule(session, index, prefetch=True)
+
+    def _schedule(self, session: InterviewSession, index: int, prefetch: bool) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._synthesize(session, index, prefetch))
+        session.tasks[index] = task
+        if prefetch:
+            session.prefetching.add(index)
+        else:
+            session.prefetching.discard(index)
+        return task
+
+    async def _synthesize(self, session: InterviewSession, index: int, prefetch: bool) -> bytes | None:
+        """Synthesize question ``index`` into ``session.audio``; returns the audio, None on failure."""
+
+        task = asyncio.current_task()
+        started = False
+        try:
+            if prefetch:
+                async with self._semaphore:
+                    started = True
+                    session.running.add(index)
+                    audio = await self.synthesize(session.questions[index], session.language)
+            else:
+                started = True
+                session.running.add(index)
+                audio = await self.synthesize(session.questions[index], session.language)
+        except Exception as e:
+            session.errors[index] = str(e)
+            logger.warning("interview_tts_failed", extra={
+                "index": index, "prefetch": prefetch, "error": str(e),
+            })
+            return None
+        finally:
+            if started:
+                session.running.discard(index)
+            if session.tasks.get(index) is task:
+                del session.tasks[index]
+                session.prefetching.discard(index)
+
+        if session.closed:
+            return audio
+        session.errors.pop(index, None)
+        session.audio[index] = audio
+        self.audio_bytes += len(audio)
+        if prefetch:
+            self.prefetched += 1
+        self._enforce_cap(session)
+        return audio
+
+    def _enforce_cap(self, protected: InterviewSession) -> None:
+        if self.audio_bytes <= self.max_audio_bytes:
+            return
+
+        def drop(session: InterviewSession, index: int) -> bool:
+            audio = session.audio.pop(index)
+            self.audio_bytes -= len(audio)
+            self.evicted_bytes += len(audio)
+            return self.audio_bytes <= self.max_audio_bytes
+
+        sessions = list(self._sessions.values())
+        # 1) Questions that were already asked
+        for session in sessions:
+            for index in sorted(i for i in session.audio if i < session.current):
+                if drop(session, index):
+                    return
+        # 2) Everything held by the least recently used sessions
+        for session in sessions:
+            if session is protected:
+                continue
+            for index in sorted(session.audio, reverse=True):
+                if drop(session, index):
+                    return
+        # 3) The furthest-ahead prefetches of the session that just grew
+        for index in sorted(protected.audio, reverse=True):
+            if index != protected.current and drop(protected, index):
+                return
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "audio_bytes": self.audio_bytes,
+            "max_audio_bytes": self.max_audio_bytes,
+            "prefetch_depth": self.prefetch_depth,
+            "prefetched": self.prefetched,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evicted_bytes": self.evicted_bytes,
+            "expired": self.expired,
+        }
+
+
+INTERVIEW_SESSIONS = InterviewSessionStore()
@@ -0,0 +1,182 @@
+# core/job_index.py
+
+"""Sparse TF-IDF index over job listings for semantic job ranking.
+
+Each job becomes an L2-normalised TF-IDF vector (sublinear tf, smoothed
+idf) over its name, description and requirement; the name is weighted
+higher and also contributes word bigrams so multi-word titles ("phân
+tích dữ liệu", "machine learning") match as phrases. Vectors are stored
+as an inverted index of compact ``array`` postings, so a query only
+touches the postings of its own terms and the cost grows with how common
+those terms are, not with the size of the feed.
+
+Synonyms and spelling variants ("back-end", "server-side", "k8s",
+"lập trình viên") are folded to one canonical term before indexing and
+querying, which lets related titles meet on shared terms.
+
+    builder = JobIndexBuilder()
+    for job in jobs:
+        builder.add(job)
+    index = builder.build()
+    index.search(query_terms("backend engineer", ["python", "docker"]), k=50)
+    # -> [(job position, cosine similarity), ...]
+"""
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+
+# Title terms count this many times as much as body terms
+NAME_WEIGHT = 3
+
+# Phrases and variants folded to one canonical token (matched on lowercase text)
+SYNONYMS = {
+    "back-end": "backend", "back end": "backend", "server-side": "backend",
+    "server side": "backend", "serverside": "backend",
+    "front-end": "frontend", "front end": "frontend", "client-side": "frontend",
+    "full-stack": "fullstack", "full stack": "fullstack",
+    "engineer": "developer", "programmer": "developer", "dev": "developer",
+    "lập trình viên": "developer", "kỹ sư": "developer",
+    "node.js": "nodejs", "node js": "nodejs", "node": "nodejs",
+    "js": "javascript", "reactjs": "react", "react.js": "react",
+    "vuejs": "vue", "vue.js": "vue",
+    "k8s": "kubernetes", "postgres": "postgresql", "mongo": "mongodb",
+    "ml": "machine learning",
+    "data analyst": "data analytics", "phân tích dữ liệu": "data analytics",
+    "qa": "tester", "qc": "tester", "kiểm thử": "tester", "test engineer": "tester",
+    "ui/ux": "designer", "ux/ui": "designer", "thiết kế": "designer",
+    "sre": "devops",
+}
+
+# Multi-word and punctuated variants are rewritten in the text; single
+# tokens are mapped after tokenizing, which is much cheaper than a regex
+_PHRASES = {k: v for k, v in SYNONYMS.items() if not re.fullmatch(r"\w+", k)}
+_TOKEN_SYNONYMS = {k: v for k, v in SYNONYMS.items() if k not in _PHRASES}
+_PHRASE_RE = re.compile(
+    r"(?<![\w+#.])("
+    + "|".join(re.escape(k) for k in sorted(_PHRASES, key=len, reverse=True))
+    + r")(?![\w+#])"
+)
+# Keeps "c++", "c#", ".net" and "ci/cd"-style parts as single tokens
+_TOKEN_RE = re.compile(r"\.?\w[\w+#]*")
+
+
+def tokenize(text: str) -> list[str]:
+    text = _PHRASE_RE.sub(lambda m: _PHRASES[m.group(1)], text.lower())
+    tokens = []
+    for token in _TOKEN_RE.findall(text):
+        mapped = _TOKEN_SYNONYMS.get(token)
+        if mapped is None:
+            tokens.append(token)
+        else:
+            tokens.extend(mapped.split())
+    return tokens
+
+
+def _bigrams(tokens: list[str]) -> list[str]:
+    return [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def job_terms(job: dict) -> Counter:
+    name = tokenize(job.get("job_name", "") or "")
+    terms = Counter()
+    for term in name + _bigrams(name):
+        terms[term] += NAME_WEIGHT
+    terms.update(tokenize(f"{job.get('job_description', '') or ''}\n{job.get('job_requirement', '') or ''}"))
+    return terms
+
+
+def query_terms(role: str, skills: list[str]) -> Counter:
+    role_tokens = tokenize(role)
+    terms = Counter(role_tokens + _bigrams(role_tokens))
+    for skill in skills:
+        skill_tokens = tokenize(skill)
+        terms.update(skill_tokens + _bigrams(skill_tokens))
+    return terms
+
+
+def _tf(count: float) -> float:
+    return 1.0 + math.log(count)
+
+
+class JobIndexBuilder:
+    """Accumulates raw term frequencies job by job; ``build()`` weights them."""
+
+    def __init__(self):
+        self._postings: dict[str, tuple[array, array]] = {}
+        self.count = 0
+
+    def add(self, job: dict) -> None:
+        position = self.count
+        self.count += 1
+        for term, count in job_terms(job).items():
+            entry = self._postings.get(term)
+            if entry is None:
+                entry = self._postings[term] = (array("I"), array("f"))
+            entry[0].append(position)
+            entry[1].append(count)
+
+    def build(self) -> "JobIndex":
+        n = self.count
+        idf = {}
+        norms = [0.0] * n
+        for term, (positions, counts) in self._postings.items():
+            term_idf = idf[term] = math.log((1 + n) / (1 + len(positions))) + 1.0
+            for i, count in enumerate(counts):
+                weight = _tf(count) * term_idf
+                counts[i] = weight
+                norms[positions[i]] += weight * weight
+        norms = [math.sqrt(v) or 1.0 for v in norms]
+        for positions, weights in self._postings.values():
+            for i, position in enumerate(positions):
+                weights[i] /= norms[position]
+
+        index = JobIndex(self._postings, idf, n)
+        self._postings = {}
+        return index
+
+
+class JobIndex:
+    def __init__(self, postings: dict[str, tuple[array, array]], idf: dict[str, float], size: int):
+        self.postings = postings
+        self.idf = idf
+        self.size = size
+
+    def stats(self) -> dict:
+        return {
+            "jobs": self.size,
+            "terms": len(self.postings),
+            "postings": sum(len(p[0]) for p in self.postings.values()),
+        }
+
+    def search(self, terms: Counter, k: int = 50, min_score: float = 0.0) -> list[tuple[int, float]]:
+        """Top ``k`` (job position, cosine similarity) pairs for a query term Counter."""
+
+        weights = {
+            term: _tf(count) * self.idf[term]
+            for term, count in terms.items()
+            if term in self.idf
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if not norm:
+            return []
+
+        scores: dict[int, float] = {}
+        get = scores.get
+        for term, weight in weights.items():
+            weight /= norm
+            positions, doc_weights = self.postings[term]
+            for position, doc_weight in zip(positions, doc_weights):
+                scores[position] = get(position, 0.0) + weight * doc_weight
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(position, score) for position, score in top if score > min_score]
+
+
+def build_index(jobs: list[dict]) -> JobIndex:
+    builder = JobIndexBuilder()
+    for job in jobs:
+        builder.add(job)
+    return builder.build()
@@ -0,0 +1,237 @@
+# core/job_loader.py
+
+"""Streaming loader for the job feed (JSON_DATA_URL or backend/job_data.json).
+
+The feed is a top-level JSON array of job objects. Instead of
+``json.load`` building the whole tree first, the array is decoded one
+element at a time from 64 KB chunks of the file or HTTP response, so peak
+memory stays close to the size of the normalised jobs and each job can be
+handed to the index builder as soon as it is parsed. Only the fields the
+API uses are kept.
+
+    jobs, index, report = load_jobs(with_index=True)
+"""
+
+import codecs
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import requests
+
+from core.config import BACKEND_DIR
+from core.job_index import JobIndex, JobIndexBuilder
+from core.log import get_logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+PROGRESS_EVERY = 5000
+JOB_DATA_PATH = BACKEND_DIR / "job_data.json"
+
+JOB_FIELDS = ("job_name", "company_name", "job_url", "job_description", "job_requirement")
+JOB_DEFAULTS = {"company_name": "Unknown", "job_url": "#"}
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JobFeedError(ValueError):
+    pass
+
+
+def peak_rss_kb() -> int | None:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array from a stream of byte chunks."""
+
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8-sig")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer = buffer[pos:] + text.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
+        return True
+
+    def skip_whitespace() -> str | None:
+        """Next significant character (not consumed), or None at end of stream."""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return None
+
+    if skip_whitespace() != "[":
+        raise JobFeedError("job feed is not a JSON array")
+    pos += 1
+
+    while True:
+        char = skip_whitespace()
+        if char is None:
+            raise JobFeedError("job feed ended inside the array")
+        if char == "]":
+            return
+        if started:
+            if char != ",":
+                raise JobFeedError(f"expected ',' at offset {pos}, got {char!r}")
+            pos += 1
+            if skip_whitespace() is None:
+                raise JobFeedError("job feed ended inside the array")
+        started = True
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Incomplete element: read more unless the stream is done
+                if not fill():
+                    raise JobFeedError(f"invalid JSON in job feed: {e}") from e
+                continue
+            # A number cut at the chunk edge ("1." + "5", "1e" + "5") decodes
+            # as a shorter number; only trust it once a character that cannot
+            # continue it is buffered.
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and (end >= len(buffer) or buffer[end] in _NUMBER_CHARS) and fill()):
+                continue
+            pos = end
+            yield value
+            break
+
+
+def normalize_job(raw: Any) -> dict | None:
+    """Keep the fields the API uses as stripped strings; None if the job is unusable."""
+
+    if not isinstance(raw, dict):
+        return None
+    job = {}
+    for field in JOB_FIELDS:
+        value = raw.get(field)
+        if value is None:
+            value = JOB_DEFAULTS.get(field, "")
+        elif not isinstance(value, str):
+            value = str(value)
+        job[field] = value.strip()
+    if not job["job_name"]:
+        return None
+    return job
+
+
+@dataclass
+class LoadReport:
+    source: str
+    jobs: int = 0
+    invalid: int = 0
+    bytes_read: int = 0
+    elapsed_s: float = 0.0
+    peak_rss_kb: int | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _counted(chunks: Iterable[bytes], report: LoadReport) -> Iterator[bytes]:
+    for chunk in chunks:
+        report.bytes_read += len(chunk)
+        yield chunk
+
+
+def load_stream(chunks: Iterable[bytes], source: str, with_index: bool = False
+                ) -> tuple[list[dict], JobIndex | None, LoadReport]:
+    """Parse, normalise and (optionally) index jobs from one byte stream."""
+
+    report = LoadReport(source=source)
+    builder = JobIndexBuilder() if with_index else None
+    jobs = []
+    started = time.perf_counter()
+
+    for raw in iter_json_array(_counted(chunks, report)):
+        job = normalize_job(raw)
+        if job is None:
+            report.invalid += 1
+            continue
+        jobs.append(job)
+        if builder is not None:
+            builder.add(job)
+        if len(jobs) % PROGRESS_EVERY == 0:
+            logger.info("job_feed_progress", extra={
+                "source": source, "jobs": len(jobs), "bytes_read": report.bytes_read,
+                "peak_rss_kb": peak_rss_kb(),
+            })
+
+    index = builder.build() if builder is not None else None
+    report.jobs = len(jobs)
+    report.elapsed_s = round(time.perf_counter() - started, 3)
+    report.peak_rss_kb = peak_rss_kb()
+    return jobs, index, report
+
+
+def _url_chunks(url: str) -> Iterator[bytes]:
+    with requests.get(url, timeout=20, stream=True) as resp:
+        if resp.status_code != 200:
+            raise JobFeedError(f"JSON_DATA_URL returned status {resp.status_code}")
+        yield from resp.iter_content(CHUNK_SIZE)
+
+
+def _file_chunks(path: Path) -> Iterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def load_jobs(with_index: bool = False, path: Path = JOB_DATA_PATH
+              ) -> tuple[list[dict], JobIndex | None, LoadReport | None]:
+    """Load job data for local + Render deployment.
+
+    Priority:
+    1) Stream from JSON_DATA_URL (npoint.io)
+    2) Fallback to local backend/job_data.json
+    3) Return [] if both fail
+    """
+
+    url = os.getenv("JSON_DATA_URL")
+    sources = []
+    if url:
+        sources.append(("url", lambda: _url_chunks(url)))
+    sources.append((str(path), lambda: _file_chunks(path)))
+
+    for source, chunks in sources:
+        if source != "url" and not path.exists():
+            logger.warning("job_data_file_missing", extra={"path": str(path)})
+            continue
+        try:
+            jobs, index, report = load_stream(chunks(), source, with_index)
+        except (JobFeedError, OSError, requests.RequestException) as e:
+            logger.warning("job_feed_failed", extra={"source": source, "error": str(e)})
+            continue
+        logger.info("job_feed_loaded", extra=report.as_dict())
+        return jobs, index, report
+
+    return [], None, None
@@ -0,0 +1,70 @@
+# core/log.py
+
+"""Structured, non-blocking logging.
+
+Records are formatted as one JSON object per line. Request handlers only
+put records on an in-memory queue (``QueueHandler``); a background
+``QueueListener`` thread does the formatting and the blocking write to
+stdout, so logging never stalls the event loop.
+
+    logger = get_logger(__name__)
+    logger.info("ocr_done", extra={"pages": 3, "elapsed_ms": 812.4})
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                  + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: str | None = None) -> None:
+    """Route the ``careercoach`` loggers through a queue to a JSON stdout handler."""
+
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger("careercoach")
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    root.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the ``careercoach`` namespace (``api.media_endpoints`` → ``careercoach.api.media_endpoints``)."""
+
+    configure_logging()
+    return logging.getLogger(f"careercoach.{name}")
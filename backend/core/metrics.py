@@ -0,0 +1,244 @@
+# core/metrics.py
+
+"""Prometheus-style metrics without an external client library.
+
+Counters, gauges and histograms live in one process-wide registry and are
+rendered in the Prometheus text exposition format by ``GET /metrics``.
+``MetricsMiddleware`` records per-route latency, in-flight requests and
+payload sizes; ``track_external_call`` times calls to Gemini, Vision, STT
+and TTS.
+"""
+
+import threading
+import time
+from contextlib import asynccontextmanager
+
+# Latency buckets in seconds, from fast local work up to slow LLM calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(key, ([*state[0]], state[1], state[2])) for key, state in self._values.items()]
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "careercoach_http_requests_total", "HTTP requests by route and status.",
+    ("method", "route", "status"),
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "careercoach_http_request_duration_seconds", "HTTP request latency by route.",
+    ("method", "route"),
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "careercoach_http_requests_in_flight", "HTTP requests currently being served.",
+))
+HTTP_REQUEST_SIZE = REGISTRY.register(Histogram(
+    "careercoach_http_request_size_bytes", "Request body size by route.",
+    ("route",), buckets=SIZE_BUCKETS,
+))
+HTTP_RESPONSE_SIZE = REGISTRY.register(Histogram(
+    "careercoach_http_response_size_bytes", "Response body size by route.",
+    ("route",), buckets=SIZE_BUCKETS,
+))
+EXTERNAL_LATENCY = REGISTRY.register(Histogram(
+    "careercoach_external_call_duration_seconds", "Latency of calls to external AI providers.",
+    ("provider", "operation", "outcome"),
+))
+EXTERNAL_IN_FLIGHT = REGISTRY.register(Gauge(
+    "careercoach_external_calls_in_flight", "External provider calls currently in progress.",
+    ("provider",),
+))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "careercoach_cache_lookups_total", "Cache lookups by cache and result (hit/miss).",
+    ("cache", "result"),
+))
+JOB_MATCHING_LATENCY = REGISTRY.register(Histogram(
+    "careercoach_job_matching_duration_seconds", "Time spent scoring jobs in recommend_jobs.",
+    ("mode",),
+))
+GEMINI_TOKENS = REGISTRY.register(Counter(
+    "careercoach_gemini_tokens_total", "Gemini tokens by prompt template and kind (input/output).",
+    ("template", "kind"),
+))
+PROMPT_TRUNCATIONS = REGISTRY.register(Counter(
+    "careercoach_prompt_truncations_total", "Requests whose user input was cut to the token budget.",
+    ("template",),
+))
+
+
+@asynccontextmanager
+async def track_external_call(provider: str, operation: str):
+    """Time one call to an external provider (gemini, vision, stt, tts)."""
+
+    EXTERNAL_IN_FLIGHT.inc(provider=provider)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_LATENCY.observe(
+            time.perf_counter() - started, provider=provider, operation=operation, outcome=outcome
+        )
+        EXTERNAL_IN_FLIGHT.dec(provider=provider)
+
+
+def _route_label(scope: dict) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    # Unmatched paths (static files, 404s) share one label to bound cardinality
+    return "static" if scope.get("method") == "GET" else "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency, status, in-flight and body sizes."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        sizes = {"request": 0, "response": 0}
+        status = {"code": 500}
+        HTTP_IN_FLIGHT.inc()
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["request"] += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            route = _route_label(scope)
+            method = scope.get("method", "")
+            HTTP_IN_FLIGHT.dec()
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status["code"]))
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_REQUEST_SIZE.observe(sizes["request"], route=route)
+            HTTP_RESPONSE_SIZE.observe(sizes["response"], route=route)
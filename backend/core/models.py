@@ -1,7 +1,7 @@
 # core/models.py
 
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 # Các model cho FastAPI Request Body
 class UserInput(BaseModel):
@@ -31,4 +31,19 @@ class TextToSpeechRequest(BaseModel):
 class JobRecommendationRequest(BaseModel):
     role: str
     skills: List[str]
-    experience_years: int = 0
\ No newline at end of file
+    experience_years: int = 0
+    # "rule" | "tfidf" | "hybrid"; None dùng JOB_MATCHING_MODE
+    mode: Optional[str] = None
+
+class ProfilerStartRequest(BaseModel):
+    # None keeps the values from PROFILER_* env vars
+    routes: Optional[List[str]] = None
+    sample_rate: Optional[float] = None
+    interval_ms: Optional[int] = None
+    block_threshold_ms: Optional[int] = None
+    reset: bool = True
+
+class InterviewSessionRequest(BaseModel):
+    # Câu hỏi theo đúng thứ tự sẽ hỏi (output của /generate-questions)
+    questions: List[str]
+    language: str = "en-US"
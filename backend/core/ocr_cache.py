@@ -0,0 +1,156 @@
+# core/ocr_cache.py
+
+"""Persistent cache of extracted CV text.
+
+Entries are keyed by (sha256 of the file, MIME type, extraction mode) and
+stored in a small sqlite file. When the stored payloads exceed the byte
+budget, the least recently used entries are evicted.
+
+Methods are blocking; call them through ``run_in_threadpool``. Storage
+errors (unwritable directory, locked database, full disk) never reach the
+caller: a failed lookup is a miss and a failed write is skipped.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from core.config import OCR_CACHE_DIR, OCR_CACHE_MAX_BYTES
+from core.log import get_logger
+from core.metrics import CACHE_LOOKUPS
+
+logger = get_logger(__name__)
+
+
+def cache_key(sha256_hex: str, mime_type: str, mode: str) -> str:
+    return f"{sha256_hex}:{mime_type}:{mode}"
+
+
+class OcrCache:
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> dict | None:
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+                    )
+                    conn.commit()
+            value = json.loads(row[0]) if row is not None else None
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self._error("get", e)
+            value = None
+
+        if value is None:
+            self.misses += 1
+            CACHE_LOOKUPS.inc(cache="ocr", result="miss")
+            return None
+        self.hits += 1
+        CACHE_LOOKUPS.inc(cache="ocr", result="hit")
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        if not self.enabled:
+            return
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, size, last_access)"
+                        " VALUES (?, ?, ?, ?)",
+                        (key, encoded, size, time.time()),
+                    )
+                    self._evict(conn)
+                    conn.commit()
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+        except (sqlite3.Error, OSError) as e:
+            self._error("put", e)
+
+    def _error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning("ocr_cache_error", extra={
+            "operation": operation, "error_type": type(error).__name__, "error": str(error),
+        })
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access"
+        ).fetchall():
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> dict:
+        entries, total = 0, 0
+        if self.enabled:
+            try:
+                with self._lock:
+                    entries, total = self._connect().execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                    ).fetchone()
+            except (sqlite3.Error, OSError) as e:
+                self._error("stats", e)
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+OCR_CACHE = OcrCache(OCR_CACHE_DIR / "ocr_cache.sqlite3", OCR_CACHE_MAX_BYTES)
@@ -0,0 +1,328 @@
+# core/profiler.py
+
+"""On-demand sampling profiler and event-loop block detector.
+
+Off by default. While running, ``ProfilerMiddleware`` picks a fraction of
+requests on the configured routes; a background thread then samples the
+Python stacks of the event-loop thread (and busy threadpool workers) every
+``interval_ms`` while at least one picked request is in flight. Samples are
+aggregated into the collapsed-stack format read by flamegraph.pl and
+speedscope:
+
+    /api/recommend-jobs;recommend_jobs (api/util_endpoints.py);match_jobs (api/util_endpoints.py) 42
+
+The same thread watches a heartbeat task on the loop. When the heartbeat is
+late by more than ``block_threshold_ms`` (synchronous work holding the
+loop), the loop's stack is captured once and reported as a blocking
+incident, with the blocked duration filled in when the loop recovers.
+
+Stopped, the middleware costs one attribute check per request.
+"""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+from core.config import (
+    BACKEND_DIR,
+    PROFILER_BLOCK_THRESHOLD_MS,
+    PROFILER_INTERVAL_MS,
+    PROFILER_ROUTES,
+    PROFILER_SAMPLE_RATE,
+)
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+MAX_STACK_DEPTH = 128
+# Distinct collapsed stacks kept; further new stacks are counted as "[truncated]"
+MAX_STACKS = 10_000
+MAX_INCIDENTS = 100
+THREADPOOL_LABEL = "[threadpool]"
+WORKER_THREAD_PREFIX = "AnyIO worker thread"
+
+# Leaf frames in these files mean the thread is parked, not doing work
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+
+def _frame_label(code) -> str:
+    path = Path(code.co_filename)
+    try:
+        filename = path.relative_to(BACKEND_DIR).as_posix()
+    except ValueError:
+        filename = path.name
+    # co_qualname chỉ có từ Python 3.11
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename})"
+
+
+def _walk(frame) -> list:
+    """Frames from ``frame`` outwards, innermost first."""
+
+    frames = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        frames.append(frame)
+        frame = frame.f_back
+    return frames
+
+
+def _is_idle(frames: list) -> bool:
+    return not frames or frames[0].f_code.co_filename.endswith(_IDLE_FILES)
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self.running = False
+        self.routes = list(PROFILER_ROUTES)
+        self.sample_rate = PROFILER_SAMPLE_RATE
+        self.interval_ms = PROFILER_INTERVAL_MS
+        self.block_threshold_ms = PROFILER_BLOCK_THRESHOLD_MS
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._loop_thread_id: int | None = None
+
+        # Middleware frame of every in-flight request → (route, sampled)
+        self._requests: dict = {}
+        self._sampled_in_flight = 0
+        self._last_beat = 0.0
+        self._pending_incident: dict | None = None
+
+        self.stacks: Counter = Counter()
+        self.incidents: deque = deque(maxlen=MAX_INCIDENTS)
+        self.samples = 0
+        self.sampled_requests = 0
+        self.started_at: str | None = None
+
+    # --- control (call from the event loop) ---
+
+    def start(self, routes=None, sample_rate=None, interval_ms=None,
+              block_threshold_ms=None, reset: bool = True) -> None:
+        if routes is not None:
+            self.routes = [r for r in routes if r]
+        if sample_rate is not None:
+            self.sample_rate = max(0.0, min(float(sample_rate), 1.0))
+        if interval_ms is not None:
+            self.interval_ms = max(1, int(interval_ms))
+        if block_threshold_ms is not None:
+            self.block_threshold_ms = max(10, int(block_threshold_ms))
+        if reset:
+            self.reset()
+        if self.running:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self.running = True
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._sampler, name="profiler-sampler", daemon=True)
+        self._thread.start()
+        logger.info("profiler_started", extra=self.settings())
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        logger.info("profiler_stopped", extra={"samples": self.samples})
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stacks.clear()
+            self.incidents.clear()
+            self.samples = 0
+            self.sampled_requests = 0
+
+    def settings(self) -> dict:
+        return {
+            "routes": self.routes,
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval_ms,
+            "block_threshold_ms": self.block_threshold_ms,
+        }
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "started_at": self.started_at,
+                **self.settings(),
+                "sampled_requests": self.sampled_requests,
+                "samples": self.samples,
+                "distinct_stacks": len(self.stacks),
+                "blocking_incidents": len(self.incidents),
+            }
+
+    # --- request tracking (middleware) ---
+
+    def wants(self, path: str) -> bool:
+        if self.routes:
+            if not any(path.startswith(prefix) for prefix in self.routes):
+                return False
+        elif not path.startswith("/api/"):
+            return False
+        return random.random() < self.sample_rate
+
+    def enter(self, frame, route: str, sampled: bool) -> None:
+        with self._lock:
+            self._requests[frame] = (route, sampled)
+            if sampled:
+                self._sampled_in_flight += 1
+                self.sampled_requests += 1
+
+    def leave(self, frame) -> None:
+        with self._lock:
+            _, sampled = self._requests.pop(frame, (None, False))
+            if sampled:
+                self._sampled_in_flight -= 1
+
+    # --- sampling thread ---
+
+    def _loop_stack(self, frames: dict) -> tuple[str | None, bool, list]:
+        """(route, sampled, frames root-first from the request's middleware frame)."""
+
+        frame = frames.get(self._loop_thread_id)
+        stack = _walk(frame)
+        if _is_idle(stack):
+            return None, False, []
+        with self._lock:
+            requests = dict(self._requests)
+        for index, candidate in enumerate(stack):
+            entry = requests.get(candidate)
+            if entry is not None:
+                route, sampled = entry
+                # Skip the middleware frame itself; the route is the root
+                return route, sampled, stack[:index][::-1]
+        return None, False, stack[::-1]
+
+    def _record(self, root: str, stack: list) -> None:
+        key = ";".join([root, *(_frame_label(f.f_code) for f in stack)])
+        with self._lock:
+            if key in self.stacks or len(self.stacks) < MAX_STACKS:
+                self.stacks[key] += 1
+            else:
+                self.stacks["[truncated]"] += 1
+            self.samples += 1
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        route, sampled, stack = self._loop_stack(frames)
+        if sampled:
+            self._record(route, stack)
+
+        # Sync endpoints and run_in_threadpool work run on AnyIO worker
+        # threads; their stacks cannot be tied to a request, so they share
+        # one root.
+        workers = {
+            thread.ident for thread in threading.enumerate()
+            if thread.name.startswith(WORKER_THREAD_PREFIX)
+        }
+        for thread_id, frame in frames.items():
+            if thread_id not in workers:
+                continue
+            stack = _walk(frame)
+            if not _is_idle(stack):
+                self._record(THREADPOOL_LABEL, stack[::-1])
+
+    def _check_blocking(self, now: float) -> None:
+        threshold = self.block_threshold_ms / 1000
+        if self._pending_incident is not None or now - self._last_beat <= threshold:
+            return
+        route, _, stack = self._loop_stack(sys._current_frames())
+        self._pending_incident = {
+            "detected_at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "route": route,
+            "blocked_ms": None,
+            "stack": [_frame_label(f.f_code) for f in stack],
+        }
+
+    def _sampler(self) -> None:
+        next_sample = 0.0
+        while not self._stop.is_set():
+            active = self._sampled_in_flight > 0
+            # Poll at the sampling interval only while a sampled request is
+            # in flight; otherwise just often enough to catch blocking.
+            tick = self.interval_ms if active else self.block_threshold_ms / 4
+            if self._stop.wait(tick / 1000):
+                break
+            now = time.perf_counter()
+            try:
+                self._check_blocking(now)
+                if active and now >= next_sample:
+                    self._sample()
+                    next_sample = now + self.interval_ms / 1000
+            except Exception as e:
+                logger.warning("profiler_sample_failed", extra={"error": str(e)})
+
+    async def _heartbeat(self) -> None:
+        interval = min(0.025, self.block_threshold_ms / 4000)
+        while self.running:
+            before = time.perf_counter()
+            await asyncio.sleep(interval)
+            after = time.perf_counter()
+            # Update the beat before taking the incident so the watchdog
+            # cannot open a second one for the same stall.
+            self._last_beat = after
+            incident, self._pending_incident = self._pending_incident, None
+            if incident is not None:
+                incident["blocked_ms"] = round((after - before - interval) * 1000, 1)
+                with self._lock:
+                    self.incidents.append(incident)
+                logger.warning("event_loop_blocked", extra={
+                    "route": incident["route"], "blocked_ms": incident["blocked_ms"],
+                })
+
+    # --- reports ---
+
+    def collapsed(self) -> str:
+        with self._lock:
+            items = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def blocking_incidents(self) -> list[dict]:
+        with self._lock:
+            return list(self.incidents)
+
+
+PROFILER = SamplingProfiler()
+
+
+class ProfilerMiddleware:
+    """Pure ASGI middleware that registers requests with ``PROFILER``."""
+
+    def __init__(self, app, autostart: bool = False):
+        self.app = app
+        self.autostart = autostart
+
+    async def __call__(self, scope, receive, send):
+        if self.autostart:
+            self.autostart = False
+            PROFILER.start()
+        if not PROFILER.running or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope.get("path", "")
+        # This coroutine's frame is on the loop's stack for the whole request,
+        # which is how the sampler ties samples back to the route.
+        frame = sys._getframe()
+        PROFILER.enter(frame, path, PROFILER.wants(path))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            PROFILER.leave(frame)
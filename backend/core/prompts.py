@@ -0,0 +1,386 @@
+# core/prompts.py
+
+"""Gemini prompt templates and their token accounting.
+
+Each endpoint that calls Gemini has a ``PromptTemplate``: the static
+instructions go into the model's system instruction and, for JSON answers,
+a ``response_schema`` with ``response_mime_type="application/json"`` makes
+Gemini return a document that parses as is. Only the user data is sent as
+the prompt of each request. The registry keeps one model per template.
+
+Before a call the input size is estimated from the characters per token
+observed in earlier responses of the same template. When the estimate is
+over the template's budget (capped by ``PROMPT_MAX_INPUT_TOKENS``) the
+fields listed in ``truncate`` (every user-supplied field) are cut, largest
+first; ``PromptTooLarge`` is raised if it still does not fit. Input/output
+tokens from ``usage_metadata`` and latency are recorded per template.
+"""
+
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, NamedTuple
+
+from core.config import PROMPT_MAX_INPUT_TOKENS
+from core.log import get_logger
+from core.metrics import GEMINI_TOKENS, PROMPT_TRUNCATIONS, track_external_call
+from core.providers import get_gemini_model
+
+logger = get_logger(__name__)
+
+# Starting estimate before any usage_metadata was seen. Vietnamese text
+# tokenizes denser than English, so stay on the low side.
+DEFAULT_CHARS_PER_TOKEN = 3.0
+# Weight of the newest observation in the running chars/token average
+CHARS_PER_TOKEN_ALPHA = 0.2
+
+TRUNCATION_MARK = "\n[... phần còn lại đã được lược bớt ...]"
+
+
+@dataclass
+class PromptTemplate:
+    name: str
+    system_instruction: str
+    # str.format template of the user turn, filled with the call's fields
+    prompt: str
+    # JSON schema of the answer; None for free text
+    response_schema: dict | None = None
+    input_budget: int = PROMPT_MAX_INPUT_TOKENS
+    # Fields that may be shortened to fit the budget: every user-supplied field
+    truncate: tuple[str, ...] = ()
+
+    @property
+    def budget(self) -> int:
+        return min(self.input_budget, PROMPT_MAX_INPUT_TOKENS)
+
+    def render(self, fields: dict) -> str:
+        return self.prompt.format(**fields)
+
+    def generation_config(self) -> dict:
+        if self.response_schema is None:
+            return {}
+        return {"response_mime_type": "application/json", "response_schema": self.response_schema}
+
+
+@dataclass
+class PromptStats:
+    calls: int = 0
+    errors: int = 0
+    truncated: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_s: float = 0.0
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN
+
+    def as_dict(self) -> dict:
+        ok = self.calls - self.errors
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "truncated": self.truncated,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "avg_input_tokens": round(self.input_tokens / ok, 1) if ok else 0.0,
+            "avg_output_tokens": round(self.output_tokens / ok, 1) if ok else 0.0,
+            "avg_latency_ms": round(self.latency_s * 1000 / self.calls, 1) if self.calls else 0.0,
+            "chars_per_token": round(self.chars_per_token, 2),
+        }
+
+
+class PromptTooLarge(ValueError):
+    def __init__(self, template: str, estimated_tokens: int, budget: int):
+        super().__init__(
+            f"Input too large for {template}: ~{estimated_tokens} tokens, budget {budget}."
+        )
+        self.template = template
+        self.estimated_tokens = estimated_tokens
+        self.budget = budget
+
+
+class PromptResult(NamedTuple):
+    text: str
+    input_tokens: int
+    output_tokens: int
+    truncated: bool
+
+    def json(self):
+        """The answer parsed as JSON (templates with a response_schema)."""
+        return json.loads(self.text)
+
+
+def _cut(text: str, max_chars: int) -> str:
+    """``text`` shortened to about ``max_chars``, at a word boundary when close."""
+
+    if len(text) <= max_chars:
+        return text
+    cut = max(text.rfind(" ", 0, max_chars), text.rfind("\n", 0, max_chars))
+    if cut < max_chars * 0.8:
+        cut = max_chars
+    return text[:cut].rstrip() + TRUNCATION_MARK
+
+
+def _usage(response) -> tuple[int, int]:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0
+    return (getattr(usage, "prompt_token_count", 0) or 0,
+            getattr(usage, "candidates_token_count", 0) or 0)
+
+
+class PromptRegistry:
+    def __init__(self, model_factory: Callable = get_gemini_model):
+        self.model_factory = model_factory
+        self._templates: dict[str, PromptTemplate] = {}
+        self._models: dict = {}
+        self._stats: dict[str, PromptStats] = {}
+
+    def register(self, template: PromptTemplate) -> PromptTemplate:
+        self._templates[template.name] = template
+        self._stats[template.name] = PromptStats()
+        return template
+
+    def model(self, name: str):
+        """The model of template ``name`` (built on first use), None if Gemini is not configured."""
+
+        if name not in self._models:
+            template = self._templates[name]
+            self._models[name] = self.model_factory(
+                system_instruction=template.system_instruction,
+                extra_config=template.generation_config(),
+            )
+        return self._models[name]
+
+    def estimate_tokens(self, name: str, text: str) -> int:
+        template = self._templates[name]
+        chars = len(template.system_instruction) + len(text)
+        return int(chars / self._stats[name].chars_per_token) + 1
+
+    def fit(self, name: str, fields: dict) -> tuple[str, bool]:
+        """(prompt, truncated): the rendered prompt, cut down to the template's budget.
+
+        Raises ``PromptTooLarge`` when it cannot be made to fit.
+        """
+
+        template = self._templates[name]
+        prompt = template.render(fields)
+        estimated = self.estimate_tokens(name, prompt)
+        over = estimated - template.budget
+        if over <= 0:
+            return prompt, False
+
+        # Characters kept of each truncatable field; shrink the longest one
+        # until the estimate fits. Fields no longer than the truncation mark
+        # cannot get shorter by cutting.
+        original = dict(fields)
+        kept = {k: len(original[k]) for k in template.truncate if len(original[k]) > len(TRUNCATION_MARK)}
+        chars_per_token = self._stats[name].chars_per_token
+        while over > 0 and kept:
+            key = max(kept, key=kept.get)
+            excess = math.ceil(over * chars_per_token)
+            if kept[key] == len(original[key]):
+                excess += len(TRUNCATION_MARK)
+            kept[key] = max(0, kept[key] - excess)
+            fields = {**fields, key: _cut(original[key], kept[key])}
+            if kept[key] == 0:
+                del kept[key]
+            prompt = template.render(fields)
+            over = self.estimate_tokens(name, prompt) - template.budget
+        if over > 0:
+            raise PromptTooLarge(name, estimated, template.budget)
+
+        logger.info("prompt_truncated", extra={
+            "template": name, "estimated_tokens": estimated, "budget": template.budget,
+        })
+        return prompt, True
+
+    async def generate(self, name: str, **fields) -> PromptResult:
+        """Call Gemini with template ``name``. Raises on provider errors."""
+
+        model = self.model(name)
+        if model is None:
+            raise RuntimeError("Gemini is not configured")
+        stats = self._stats[name]
+        prompt, truncated = self.fit(name, fields)
+        if truncated:
+            stats.truncated += 1
+            PROMPT_TRUNCATIONS.inc(template=name)
+
+        stats.calls += 1
+        started = time.perf_counter()
+        try:
+            async with track_external_call("gemini", name):
+                response = await model.generate_content_async(prompt)
+            text = response.text.strip()
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.latency_s += time.perf_counter() - started
+
+        input_tokens, output_tokens = _usage(response)
+        stats.input_tokens += input_tokens
+        stats.output_tokens += output_tokens
+        GEMINI_TOKENS.inc(input_tokens, template=name, kind="input")
+        GEMINI_TOKENS.inc(output_tokens, template=name, kind="output")
+        if input_tokens:
+            observed = (len(self._templates[name].system_instruction) + len(prompt)) / input_tokens
+            stats.chars_per_token += CHARS_PER_TOKEN_ALPHA * (observed - stats.chars_per_token)
+        logger.debug("gemini_usage", extra={
+            "template": name, "input_tokens": input_tokens, "output_tokens": output_tokens,
+        })
+        return PromptResult(text, input_tokens, output_tokens, truncated)
+
+    def stats(self) -> dict:
+        return {
+            name: {**stats.as_dict(), "budget": self._templates[name].budget}
+            for name, stats in self._stats.items()
+        }
+
+
+PROMPTS = PromptRegistry()
+
+
+# --- Templates ---
+
+def _string(description: str) -> dict:
+    return {"type": "string", "description": description}
+
+
+def _strings(description: str) -> dict:
+    return {"type": "array", "items": {"type": "string"}, "description": description}
+
+
+EVALUATE = PROMPTS.register(PromptTemplate(
+    name="evaluate",
+    system_instruction="""Bạn là một huấn luyện viên phỏng vấn chuyên gia có tên CareerCoach. Hãy phân tích đầu vào của người dùng.
+
+Nếu đầu vào rõ ràng là một câu trả lời phỏng vấn, trả về type "evaluation" kèm "feedback" và "suggested_answer". Luôn có "suggested_answer", không bao giờ để trống.
+Ngoài ra, trả về type "general_answer" kèm "response".
+
+Tất cả nội dung phải viết bằng tiếng Việt.""",
+    prompt="Đầu vào người dùng:\n{user_answer}",
+    response_schema={
+        "type": "object",
+        "properties": {
+            "type": {"type": "string", "enum": ["evaluation", "general_answer"]},
+            "feedback": _string("Phản hồi chi tiết về điểm mạnh và yếu, với những gợi ý cụ thể để cải thiện."),
+            "suggested_answer": _string("Một câu trả lời ví dụ tốt hơn cho câu hỏi này dựa trên câu trả lời của người dùng."),
+            "response": _string("Phản hồi của bạn cho đầu vào của người dùng."),
+        },
+        "required": ["type"],
+    },
+    input_budget=2000,
+    truncate=("user_answer",),
+))
+
+ANALYZE_CV = PROMPTS.register(PromptTemplate(
+    name="analyze_cv",
+    system_instruction="""Bạn là chuyên gia hướng dẫn nghề nghiệp và phân tích sơ yếu lý lịch.
+
+Phân tích văn bản sơ yếu lý lịch người dùng gửi và trích xuất các thông tin chi tiết toàn diện, có tính đến vai trò và tổ chức mục tiêu nếu có.
+
+QUAN TRỌNG: TẤT CẢ nội dung phân tích, mô tả, điểm mạnh, điểm yếu, lộ trình học tập, nhiệm vụ đề xuất PHẢI viết bằng TIẾNG VIỆT, kể cả khi CV gốc bằng tiếng Anh.""",
+    prompt="""Văn bản CV:
+{cv_text}
+
+VAI TRÒ MỤC TIÊU (nếu có): {role}
+TỔ CHỨC MỤC TIÊU (nếu có): {organization}""",
+    response_schema={
+        "type": "object",
+        "properties": {
+            "extracted_role": _string("Vai trò/vị trí chính dựa trên CV (ví dụ: 'Kỹ sư phần mềm', 'Quản lý tiếp thị')"),
+            "skills": _strings("Các kỹ năng trong CV"),
+            "experience_years": _string("Số năm kinh nghiệm ước tính"),
+            "experience_summary": _string("Tóm tắt ngắn gọn về kinh nghiệm làm việc"),
+            "education": _string("Nền tảng giáo dục"),
+            "strengths": _strings("Điểm mạnh"),
+            "weaknesses": _strings("Điểm yếu"),
+            "learning_path": {
+                "type": "object",
+                "properties": {
+                    "immediate": _strings("Kỹ năng hoặc lĩnh vực cần học ngay lập tức"),
+                    "short_term": _strings("Kỹ năng cho 3-6 tháng tới"),
+                    "long_term": _strings("Kỹ năng cho 6-12 tháng"),
+                },
+                "required": ["immediate", "short_term", "long_term"],
+            },
+            "recommended_tasks": _strings("Nhiệm vụ đề xuất"),
+        },
+        "required": [
+            "extracted_role", "skills", "experience_years", "experience_summary", "education",
+            "strengths", "weaknesses", "learning_path", "recommended_tasks",
+        ],
+    },
+    truncate=("cv_text", "role", "organization"),
+))
+
+_CV_PROFILE = """ROLE: {role}
+SKILLS: {skills}
+EXPERIENCE: {experience}
+EDUCATION: {education}
+ACHIEVEMENTS:
+{achievements}"""
+
+GENERATE_CV = PROMPTS.register(PromptTemplate(
+    name="generate_cv",
+    system_instruction="""You are an expert CV/resume writer.
+
+Create a professional CV in Markdown format, in English, for the candidate profile the user sends, with the following sections:
+- Header with name and contact (use placeholders)
+- Professional Summary
+- Skills
+- Work Experience
+- Education
+- Achievements
+- Additional relevant sections
+
+Make it ATS-friendly and professional. Use proper Markdown formatting.
+Return ONLY the Markdown content, no JSON, no code blocks.""",
+    prompt=_CV_PROFILE,
+    input_budget=3000,
+    truncate=("role", "skills", "experience", "education", "achievements"),
+))
+
+GENERATE_CV_DOCX = PROMPTS.register(PromptTemplate(
+    name="generate_cv_docx",
+    system_instruction="""You are an expert CV/resume writer.
+
+Create a professional CV, in English, for the candidate profile the user sends, with the following sections:
+- Header with [Your Full Name] and contact placeholders
+- Professional Summary (2-3 sentences)
+- Skills (list format)
+- Work Experience (with job titles, companies, dates, responsibilities)
+- Education
+- Achievements
+
+Make it ATS-friendly and professional. Use clear section headers.
+Return plain text content, no markdown syntax, no code blocks.""",
+    prompt=_CV_PROFILE,
+    input_budget=3000,
+    truncate=("role", "skills", "experience", "education", "achievements"),
+))
+
+GENERATE_QUESTIONS = PROMPTS.register(PromptTemplate(
+    name="generate_questions",
+    system_instruction="""Bạn là chuyên gia tuyển dụng nhân sự cấp cao. Hãy tạo 15-20 câu hỏi phỏng vấn cho hồ sơ người dùng gửi.
+
+Mỗi câu hỏi PHẢI bắt đầu chính xác với một thẻ: [Background], [Situation], hoặc [Technical].
+Ví dụ:
+"[Background] Hãy kể cho tôi nghe về kinh nghiệm của bạn với việc phân tích dữ liệu."
+"[Situation] Mô tả cách bạn xử lý một hạn chót khó khăn."
+"[Technical] Giải thích các khái niệm chính của học máy."
+
+Đặt câu hỏi cụ thể cho vai trò và kỹ năng.""",
+    prompt="""TARGET ROLE: {role}
+FIELD: {field}
+KEY SKILLS: {skills}""",
+    response_schema={
+        "type": "array",
+        "items": {"type": "string"},
+        "min_items": 15,
+        "max_items": 20,
+    },
+    input_budget=1000,
+    truncate=("role", "field", "skills"),
+))
@@ -0,0 +1,83 @@
+# core/providers.py
+
+"""Factories for the external AI clients.
+
+Endpoints get their Gemini model and Google Cloud clients from here so that
+``PROVIDER_MODE=fake`` can swap all of them for the local stand-ins in
+core/fake_providers.py.
+"""
+
+import os
+
+import google.generativeai as genai
+from google.cloud import speech, texttospeech, vision
+
+from core.config import GEMINI_MODEL as _GOOGLE_GEMINI_MODEL
+from core.config import (
+    GEMINI_MODEL_NAME,
+    PROVIDER_MODE,
+    generation_config,
+    get_credential_path,
+    safety_settings,
+)
+from core.log import get_logger
+
+USE_FAKES = PROVIDER_MODE == "fake"
+
+if USE_FAKES:
+    from core import fake_providers
+
+    get_logger(__name__).warning("fake_providers_enabled")
+    GEMINI_MODEL = fake_providers.FakeGeminiModel()
+    _FAKE_VISION = fake_providers.FakeVisionClient()
+    _FAKE_SPEECH = fake_providers.FakeSpeechClient()
+    _FAKE_TTS = fake_providers.FakeTextToSpeechClient()
+else:
+    GEMINI_MODEL = _GOOGLE_GEMINI_MODEL
+
+
+def get_gemini_model(system_instruction: str | None = None,
+                     extra_config: dict | None = None) -> genai.GenerativeModel | None:
+    """A Gemini model with its own system instruction and generation config.
+
+    ``extra_config`` is merged over the shared generation config (e.g.
+    ``response_mime_type``/``response_schema``). None when Gemini is not
+    configured.
+    """
+    config = {**generation_config, **(extra_config or {})}
+    if USE_FAKES:
+        return fake_providers.FakeGeminiModel(
+            system_instruction=system_instruction, generation_config=config
+        )
+    if GEMINI_MODEL is None:
+        return None
+    return genai.GenerativeModel(
+        GEMINI_MODEL_NAME,
+        generation_config=config,
+        safety_settings=safety_settings,
+        system_instruction=system_instruction,
+    )
+
+
+def get_vision_client() -> vision.ImageAnnotatorAsyncClient:
+    if USE_FAKES:
+        return _FAKE_VISION
+    ocr_key_path = get_credential_path("ocr_key.json")
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = ocr_key_path
+    return vision.ImageAnnotatorAsyncClient()
+
+
+def get_speech_client() -> speech.SpeechAsyncClient:
+    if USE_FAKES:
+        return _FAKE_SPEECH
+    speech_key_path = get_credential_path("speech_key.json")
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = speech_key_path
+    return speech.SpeechAsyncClient()
+
+
+def get_tts_client() -> texttospeech.TextToSpeechAsyncClient:
+    if USE_FAKES:
+        return _FAKE_TTS
+    speech_key_path = get_credential_path("speech_key.json")
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = speech_key_path
+    return texttospeech.TextToSpeechAsyncClient()
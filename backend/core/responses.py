@@ -0,0 +1,33 @@
+# core/responses.py
+
+"""JSON encoding shared by the routers.
+
+``JSONResponse`` is FastAPI's ``ORJSONResponse`` when orjson is installed
+and Starlette's stdlib-based ``JSONResponse`` otherwise; the routers use
+it both as ``default_response_class`` and for explicit returns, so
+swapping the encoder needs no endpoint changes. ``dumps`` encodes to
+UTF-8 bytes the same way, for code that assembles bodies by hand.
+"""
+
+import json
+
+from fastapi.responses import JSONResponse as StdJSONResponse
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except ImportError:
+    orjson = None
+    ORJSONResponse = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+JSONResponse = ORJSONResponse or StdJSONResponse
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON (non-ASCII kept as is), like the response classes."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
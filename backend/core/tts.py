@@ -0,0 +1,48 @@
+# core/tts.py
+
+"""Google Cloud Text-to-Speech with the app's voice settings."""
+
+from google.cloud import texttospeech
+
+from core.metrics import track_external_call
+from core.providers import get_tts_client
+
+
+def voice_for(language: str | None) -> tuple[str, str]:
+    """(language_code, voice_name) for a request language, default en-US."""
+
+    language = language.lower() if language else "en-US"
+
+    # Map Vietnamese language code to proper Google Cloud code
+    if language in ["vi", "vi-vn", "vietnamese"]:
+        # Use a Vietnamese voice (female neural voice)
+        return "vi-VN", "vi-VN-Neural2-A"
+    return "en-US", "en-US-Neural2-F"
+
+
+async def synthesize_speech(text: str, language: str | None) -> bytes:
+    """MP3 audio for ``text``. Raises on provider errors."""
+
+    client = get_tts_client()
+    language_code, voice_name = voice_for(language)
+
+    synthesis_input = texttospeech.SynthesisInput(text=text)
+    voice = texttospeech.VoiceSelectionParams(
+        language_code=language_code,
+        name=voice_name,
+        ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
+    )
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.MP3,
+        speaking_rate=0.85,
+        pitch=-2.0,
+        volume_gain_db=0.0
+    )
+
+    async with track_external_call("tts", "synthesize"):
+        response = await client.synthesize_speech(
+            input=synthesis_input,
+            voice=voice,
+            audio_config=audio_config
+        )
+    return response.audio_content
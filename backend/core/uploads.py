@@ -0,0 +1,215 @@
+# core/uploads.py
+
+"""Size-bounded ingestion of multipart uploads.
+
+``UploadLimitMiddleware`` caps the request body of the upload routes before
+FastAPI parses the form: a too large ``Content-Length`` is rejected without
+reading the body, and a body without one is counted as it arrives, so an
+oversized upload is never spooled to disk. ``ingest_upload`` then checks the
+exact per-file limit, computes the SHA-256 and sniffs the MIME type from the
+magic bytes. Small uploads are read into memory once; larger ones are
+memory-mapped straight from Starlette's spooled temp file. Downstream code
+gets a ``memoryview`` instead of copies.
+"""
+
+import hashlib
+import mmap
+from dataclasses import dataclass, field
+
+from fastapi import UploadFile
+
+from core.config import UPLOAD_SPOOL_BYTES
+from core.responses import JSONResponse
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 4096
+# Multipart framing and small form fields on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds the {limit / (1024 * 1024):.1f} MB limit.")
+        self.limit = limit
+
+
+def sniff_mime(head: bytes) -> str | None:
+    """Guess a MIME type from the first bytes of a file."""
+
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head.startswith((b"II*\x00", b"MM\x00*")):
+        return "image/tiff"
+    if head.startswith(b"PK\x03\x04"):
+        # DOCX is a zip whose first entries live under word/
+        return DOCX_MIME_TYPE if b"word/" in head else "application/zip"
+    if head.startswith(b"\x1aE\xdf\xa3"):
+        return "audio/webm"
+    if head.startswith(b"OggS"):
+        return "audio/ogg"
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return "audio/wav"
+    if head.startswith(b"fLaC"):
+        return "audio/flac"
+    if head.startswith(b"ID3") or head[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
+        return "audio/mpeg"
+    return None
+
+
+@dataclass
+class IngestedUpload:
+    filename: str | None
+    declared_type: str | None
+    sniffed_type: str | None
+    size: int
+    sha256: str
+    _buffer: bytes | None = field(default=None, repr=False)
+    _mmap: mmap.mmap | None = field(default=None, repr=False)
+
+    @property
+    def spilled(self) -> bool:
+        return self._mmap is not None
+
+    @property
+    def mime_type(self) -> str | None:
+        """Sniffed type when recognised, else what the client declared."""
+
+        if self.sniffed_type == "application/zip" and self.declared_type == DOCX_MIME_TYPE:
+            return DOCX_MIME_TYPE
+        return self.sniffed_type or self.declared_type
+
+    def view(self) -> memoryview:
+        if self._mmap is not None:
+            return memoryview(self._mmap)
+        return memoryview(self._buffer if self._buffer is not None else b"")
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A view is still alive somewhere; the map is freed with it.
+                pass
+            self._mmap = None
+        self._buffer = None
+
+    def __enter__(self) -> "IngestedUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def ingest_upload(
+    upload: UploadFile,
+    max_bytes: int,
+    spool_bytes: int = UPLOAD_SPOOL_BYTES,
+) -> IngestedUpload:
+    """Hash and sniff ``upload``. Raises ``UploadTooLarge`` past ``max_bytes``.
+
+    Uploads above ``spool_bytes`` are memory-mapped from the file Starlette
+    spooled while parsing the form. The map stays valid after Starlette
+    closes that file at the end of the request.
+    """
+
+    await upload.seek(0)
+    if upload.size is None or upload.size <= spool_bytes:
+        content = await upload.read(max_bytes + 1)
+        if len(content) > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        return IngestedUpload(
+            filename=upload.filename,
+            declared_type=upload.content_type,
+            sniffed_type=sniff_mime(content[:SNIFF_BYTES]),
+            size=len(content),
+            sha256=hashlib.sha256(content).hexdigest(),
+            _buffer=content,
+        )
+
+    if upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    hasher = hashlib.sha256()
+    head = b""
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+        if len(head) < SNIFF_BYTES:
+            head += chunk[:SNIFF_BYTES - len(head)]
+
+    return IngestedUpload(
+        filename=upload.filename,
+        declared_type=upload.content_type,
+        sniffed_type=sniff_mime(head),
+        size=upload.size,
+        sha256=hasher.hexdigest(),
+        # fileno() rolls an in-memory spool over to disk if needed
+        _mmap=mmap.mmap(upload.file.fileno(), 0, access=mmap.ACCESS_READ),
+    )
+
+
+class UploadLimitMiddleware:
+    """Pure ASGI middleware: caps the request body of upload routes by path.
+
+    ``limits`` maps a path to the largest file it accepts; the body may be
+    ``MULTIPART_OVERHEAD_BYTES`` larger for the multipart framing.
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        body_limit = limit + MULTIPART_OVERHEAD_BYTES
+        headers = dict(scope.get("headers") or [])
+        try:
+            declared = int(headers.get(b"content-length", b""))
+        except ValueError:
+            declared = None
+        if declared is not None and declared > body_limit:
+            await self._reject(limit, scope, receive, send)
+            return
+
+        state = {"received": 0, "exceeded": False, "started": False}
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > body_limit:
+                    state["exceeded"] = True
+                    # Stops the form parser; the error response is replaced below
+                    raise UploadTooLarge(limit)
+            return message
+
+        async def send_wrapper(message):
+            if state["exceeded"]:
+                return
+            if message["type"] == "http.response.start":
+                state["started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            if not state["exceeded"]:
+                raise
+        if state["exceeded"] and not state["started"]:
+            await self._reject(limit, scope, receive, send)
+
+    @staticmethod
+    async def _reject(limit: int, scope, receive, send) -> None:
+        response = JSONResponse(status_code=413, content={"error": str(UploadTooLarge(limit))})
+        await response(scope, receive, send)
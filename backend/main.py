@@ -1,50 +1,28 @@
 # main.py
 
-import json
-import os
-from pathlib import Path
-
-import requests
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 # Import các router đã chia nhỏ
-from api import ai_endpoints, media_endpoints, util_endpoints
+from api import (
+    admin_endpoints,
+    ai_endpoints,
+    interview_endpoints,
+    media_endpoints,
+    pipeline_endpoints,
+    util_endpoints,
+)
 # Lưu ý: core/config.py sẽ tự động chạy khi bạn import các file trên
+from core.log import configure_logging
+from core.config import MAX_AUDIO_UPLOAD_BYTES, MAX_CV_UPLOAD_BYTES, PROFILER_ENABLED
+from core.metrics import REGISTRY, MetricsMiddleware
+from core.profiler import ProfilerMiddleware
+from core.uploads import UploadLimitMiddleware
 
+configure_logging()
 
-def get_job_data():
-    """Load job data for deployment.
-
-    Priority:
-    1) Fetch from JSON_DATA_URL (e.g., npoint.io)
-    2) Fallback to local backend/job_data.json
-    3) Return [] if both fail
-    """
-
-    url = os.getenv("JSON_DATA_URL")
-    if url:
-        try:
-            resp = requests.get(url, timeout=20)
-            if resp.status_code == 200:
-                data = resp.json()
-                return data if isinstance(data, list) else []
-        except Exception as e:
-            print(f"Warning: failed to fetch JSON_DATA_URL: {e}")
-
-    try:
-        data_path = Path(__file__).resolve().parent / "job_data.json"
-        with data_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except Exception as e:
-        print(f"Warning: failed to read local job_data.json: {e}")
-
-    return []
-
-
-# Global job dataset (usable by routers if imported)
-JOBS = get_job_data()
+# Dữ liệu việc làm được load một lần (streaming) trong api/util_endpoints.py: JOB_DATABASE
 
 app = FastAPI()
 
@@ -54,6 +32,13 @@ origins = [
 ]
 
 # --- Cấu hình Middleware ---
+# Chặn upload quá lớn trước khi FastAPI parse form (không spool ra đĩa).
+# Thêm trước CORS để response 413 vẫn có header CORS.
+app.add_middleware(UploadLimitMiddleware, limits={
+    "/api/upload-cv": MAX_CV_UPLOAD_BYTES,
+    "/api/cv-pipeline": MAX_CV_UPLOAD_BYTES,
+    "/api/process-voice": MAX_AUDIO_UPLOAD_BYTES,
+})
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], 
@@ -61,12 +46,26 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Đo latency / status / kích thước payload theo route cho /metrics
+app.add_middleware(MetricsMiddleware)
+# Sampling profiler: tắt mặc định, bật qua PROFILER_ENABLED hoặc /api/admin/profiler/start
+app.add_middleware(ProfilerMiddleware, autostart=PROFILER_ENABLED)
 
 # --- ĐĂNG KÝ CÁC ENDPOINT ĐÃ CHIA NHỎ ---
 # Sử dụng prefix /api để các endpoint trong router tự động có tiền tố /api
 app.include_router(ai_endpoints.router, prefix="/api")
 app.include_router(media_endpoints.router, prefix="/api")
 app.include_router(util_endpoints.router, prefix="/api") 
+app.include_router(pipeline_endpoints.router, prefix="/api")
+app.include_router(interview_endpoints.router, prefix="/api")
+app.include_router(admin_endpoints.router, prefix="/api")
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 
 # --- Cấu hình Static Files (Frontend) ---
 app.mount("/", 
@@ -0,0 +1,52 @@
+# tests/test_ai_endpoints.py
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from api import ai_endpoints
+from core.prompts import EVALUATE, PromptRegistry
+
+
+class CannedModel:
+    def __init__(self, answer: dict):
+        self.answer = answer
+
+    async def generate_content_async(self, prompt):
+        return SimpleNamespace(text=json.dumps(self.answer, ensure_ascii=False))
+
+
+def evaluate_with(monkeypatch, answer: dict) -> dict:
+    registry = PromptRegistry(model_factory=lambda **kwargs: CannedModel(answer))
+    registry.register(EVALUATE)
+    monkeypatch.setattr(ai_endpoints, "PROMPTS", registry)
+    monkeypatch.setattr(ai_endpoints, "GEMINI_MODEL", object())
+    response = asyncio.run(ai_endpoints.get_gemini_evaluation("Tôi làm Python 3 năm."))
+    assert response.status_code == 200
+    return json.loads(response.body)
+
+
+@pytest.mark.parametrize("answer", [
+    {"type": "evaluation", "feedback": "Tốt."},
+    {"type": "evaluation", "feedback": "Tốt.", "suggested_answer": ""},
+])
+def test_evaluation_without_suggested_answer_gets_a_fallback(monkeypatch, answer):
+    data = evaluate_with(monkeypatch, answer)
+    assert data == {
+        "type": "evaluation",
+        "feedback": "Tốt.",
+        "suggested_answer": ai_endpoints.FALLBACK_SUGGESTED_ANSWER,
+    }
+
+
+def test_evaluation_without_feedback_gets_a_fallback(monkeypatch):
+    data = evaluate_with(monkeypatch, {"type": "evaluation", "suggested_answer": "Ví dụ."})
+    assert data["feedback"] == ai_endpoints.FALLBACK_FEEDBACK
+    assert data["suggested_answer"] == "Ví dụ."
+
+
+def test_general_answer_is_passed_through(monkeypatch):
+    data = evaluate_with(monkeypatch, {"type": "general_answer", "response": "Xin chào."})
+    assert data == {"type": "general_answer", "response": "Xin chào."}
@@ -0,0 +1,50 @@
+# tests/test_extraction.py
+
+import io
+
+from docx import Document
+
+from core.extraction import _extract_docx
+
+
+def docx_bytes(build) -> bytes:
+    doc = Document()
+    build(doc)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def extract(build) -> list[str]:
+    return _extract_docx(docx_bytes(build)).pages[0].text.split("\n")
+
+
+def test_paragraphs_and_tables_keep_document_order():
+    def build(doc):
+        doc.add_paragraph("Header paragraph")
+        table = doc.add_table(rows=1, cols=2)
+        table.rows[0].cells[0].text = "Skills"
+        table.rows[0].cells[1].text = "Python"
+        doc.add_paragraph("Footer paragraph after table")
+
+    assert extract(build) == ["Header paragraph", "Skills | Python", "Footer paragraph after table"]
+
+
+def test_repeated_cell_values_are_kept():
+    def build(doc):
+        table = doc.add_table(rows=2, cols=3)
+        for row, values in zip(table.rows, [("Python", "Yes", "Yes"), ("Experience", "3", "3")]):
+            for cell, value in zip(row.cells, values):
+                cell.text = value
+
+    assert extract(build) == ["Python | Yes | Yes", "Experience | 3 | 3"]
+
+
+def test_merged_cells_are_emitted_once():
+    def build(doc):
+        table = doc.add_table(rows=1, cols=3)
+        merged = table.rows[0].cells[0].merge(table.rows[0].cells[1])
+        merged.text = "Education"
+        table.rows[0].cells[2].text = "BSc"
+
+    assert extract(build) == ["Education | BSc"]
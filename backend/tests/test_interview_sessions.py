@@ -0,0 +1,77 @@
+# tests/test_interview_sessions.py
+
+import asyncio
+
+from core.interview_sessions import InterviewSessionStore
+
+
+def make_store(**kwargs) -> tuple[InterviewSessionStore, list[str]]:
+    calls = []
+
+    async def synthesize(text: str, language: str) -> bytes:
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return text.encode()
+
+    options = {"prefetch_depth": 2, "concurrency": 1, **kwargs}
+    return InterviewSessionStore(synthesize=synthesize, **options), calls
+
+
+def test_concurrent_requests_for_a_queued_question_share_one_synthesis():
+    async def run():
+        store, calls = make_store()
+        session = store.create([f"q{i}" for i in range(6)], "en-US")
+        # Question 3 is not prefetched yet; both requests must get its audio
+        results = await asyncio.gather(
+            store.audio(session, 3), store.audio(session, 3), return_exceptions=True
+        )
+        assert [r[0] for r in results] == [b"q3", b"q3"]
+        assert calls.count("q3") == 1
+
+    asyncio.run(run())
+
+
+def test_waiting_request_cancels_a_queued_prefetch():
+    async def run():
+        store, calls = make_store()
+        session = store.create([f"q{i}" for i in range(6)], "en-US")
+        await asyncio.sleep(0)
+        # q2 is queued behind q0/q1 on the prefetch semaphore
+        assert 2 in session.prefetching and 2 not in session.running
+        results = await asyncio.gather(store.audio(session, 2), store.audio(session, 2))
+        assert [r[0] for r in results] == [b"q2", b"q2"]
+        assert calls.count("q2") == 1
+
+    asyncio.run(run())
+
+
+def test_prefetched_question_is_served_from_memory():
+    async def run():
+        store, _ = make_store()
+        session = store.create(["q0", "q1", "q2"], "en-US")
+        assert await store.audio(session, 0) == (b"q0", False)
+        await asyncio.sleep(0.1)
+        assert await store.audio(session, 1) == (b"q1", True)
+
+    asyncio.run(run())
+
+
+def test_advancing_while_synthesizing_under_a_tight_cap():
+    async def synthesize(text: str, language: str) -> bytes:
+        # q0 is slow, q1 is instant: q0 lands after the client moved on
+        await asyncio.sleep(0.05 if text == "q0" else 0)
+        return text.encode() * 500
+
+    async def run():
+        store = InterviewSessionStore(synthesize=synthesize, max_audio_bytes=1500,
+                                      prefetch_depth=0, concurrency=1)
+        session = store.create(["q0", "q1"], "en-US")
+        first = asyncio.create_task(store.audio(session, 0))
+        await asyncio.sleep(0)
+        assert await store.audio(session, 1) == (b"q1" * 500, False)
+        # Storing q0 goes over the cap and drops it (already asked),
+        # but the request that waited for it still gets the audio
+        assert await first == (b"q0" * 500, False)
+        assert 0 not in session.audio
+
+    asyncio.run(run())
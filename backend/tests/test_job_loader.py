@@ -0,0 +1,85 @@
+# tests/test_job_loader.py
+
+import json
+import random
+
+import pytest
+
+from core.job_loader import JobFeedError, iter_json_array
+
+DOCUMENT = [
+    0,
+    -12,
+    1.5,
+    -2.5e-3,
+    1e10,
+    True,
+    False,
+    None,
+    "plain",
+    "a ] b [ c",
+    'escaped \\" ] quote',
+    "Tiếng Việt có dấu",
+    [],
+    [[1, [2, [3]]], {"k": "]"}],
+    {"job_name": "Python developer", "tags": ["a", "]", {"x": [1.25]}]},
+]
+
+
+def split_randomly(data: bytes, rng: random.Random) -> list[bytes]:
+    chunks = []
+    start = 0
+    while start < len(data):
+        end = start + rng.randint(1, 8)
+        chunks.append(data[start:end])
+        start = end
+    return chunks
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_chunk_splits(seed):
+    rng = random.Random(seed)
+    data = json.dumps(DOCUMENT, ensure_ascii=False, indent=rng.choice([None, 2])).encode("utf-8")
+    assert list(iter_json_array(split_randomly(data, rng))) == DOCUMENT
+
+
+def test_every_byte_its_own_chunk():
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode("utf-8")
+    assert list(iter_json_array([bytes([b]) for b in data])) == DOCUMENT
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    ([b"[1.", b"5]"], [1.5]),
+    ([b"[1", b".5]"], [1.5]),
+    ([b"[1e", b"5]"], [1e5]),
+    ([b"[1e-", b"2, 3]"], [1e-2, 3]),
+    ([b"[-", b"7]"], [-7]),
+    ([b"[12", b"34", b"]"], [1234]),
+    ([b"[tr", b"ue, nu", b"ll]"], [True, None]),
+])
+def test_scalars_cut_at_chunk_edges(chunks, expected):
+    assert list(iter_json_array(chunks)) == expected
+
+
+def test_byte_order_mark_and_whitespace():
+    data = "﻿ \n [ 1 ,\t{\"a\": \"]\"} ] \n".encode("utf-8")
+    assert list(iter_json_array([data[:5], data[5:]])) == [1, {"a": "]"}]
+
+
+def test_empty_array():
+    assert list(iter_json_array([b"  [", b" ]"])) == []
+
+
+@pytest.mark.parametrize("chunks", [
+    [b'{"job_name": "x"}'],
+    [b""],
+    [b"[1, 2"],
+    [b'[{"a": 1}'],
+    [b"[1 2]"],
+    [b"[1.5.3]"],
+    [b"[1,", b" oops]"],
+    [b'["unterminated]'],
+])
+def test_malformed_input(chunks):
+    with pytest.raises(JobFeedError):
+        list(iter_json_array(chunks))
@@ -0,0 +1,44 @@
+# tests/test_prompts.py
+
+import pytest
+
+from core.prompts import TRUNCATION_MARK, PromptRegistry, PromptTemplate, PromptTooLarge
+
+
+def make_registry(**template) -> PromptRegistry:
+    registry = PromptRegistry(model_factory=lambda **kwargs: None)
+    registry.register(PromptTemplate(**{
+        "name": "t",
+        "system_instruction": "system " * 50,
+        "prompt": "ROLE: {role}\nCV:\n{cv_text}",
+        "input_budget": 1000,
+        "truncate": ("role", "cv_text"),
+        **template,
+    }))
+    return registry
+
+
+def test_small_input_is_sent_unchanged():
+    registry = make_registry()
+    prompt, truncated = registry.fit("t", {"role": "dev", "cv_text": "python"})
+    assert prompt == "ROLE: dev\nCV:\npython"
+    assert not truncated
+
+
+@pytest.mark.parametrize("fields", [
+    {"role": "dev", "cv_text": "word " * 20000},
+    {"role": "x" * 20000, "cv_text": "python"},
+    {"role": "r" * 9000, "cv_text": "c" * 9000},
+])
+def test_oversized_fields_are_cut_to_the_budget(fields):
+    registry = make_registry()
+    prompt, truncated = registry.fit("t", fields)
+    assert truncated
+    assert TRUNCATION_MARK in prompt
+    assert registry.estimate_tokens("t", prompt) <= 1000
+
+
+def test_input_that_cannot_fit_is_rejected():
+    registry = make_registry(system_instruction="s" * 6000)
+    with pytest.raises(PromptTooLarge):
+        registry.fit("t", {"role": "dev", "cv_text": "python " * 100})
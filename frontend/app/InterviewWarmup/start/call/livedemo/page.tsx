@@ -1,6 +1,6 @@
 "use client";
 
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import Link from "next/link";
 import { parseMarkdown, renderMarkdown } from "@/app/utils/markdownParser";
 import { apiUrl } from "@/app/utils/apiBaseUrl";
@@ -24,6 +24,26 @@ function getLanguageFromStorage(): string {
   return "en";
 }
 
+// Creates a server-side interview session so the audio of the next questions
+// is synthesized while the user answers the current one
+async function createInterviewSession(
+  questions: string[],
+  language: string
+): Promise<string | null> {
+  try {
+    const res = await fetch(apiUrl("/api/interview/sessions"), {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ questions, language }),
+    });
+    if (!res.ok) return null;
+    const data = await res.json();
+    return data.session_id ?? null;
+  } catch {
+    return null;
+  }
+}
+
 export default function LiveDemoPage() {
   const [questions, setQuestions] = useState<Question[]>([]);
   const [currentQuestionIndex, setCurrentQuestionIndex] = useState(0);
@@ -43,6 +63,7 @@ export default function LiveDemoPage() {
   const [currentAudio, setCurrentAudio] = useState<HTMLAudioElement | null>(
     null
   );
+  const sessionRef = useRef<Promise<string | null> | null>(null);
 
   useEffect(() => {
     const storedQuestions = localStorage.getItem("interviewQuestions");
@@ -86,7 +107,12 @@ export default function LiveDemoPage() {
           randomQuestions.push(remaining.splice(randomIdx, 1)[0]);
         }
 
-        setQuestions(randomQuestions.slice(0, 5));
+        const selected = randomQuestions.slice(0, 5);
+        setQuestions(selected);
+        sessionRef.current = createInterviewSession(
+          selected.map((q) => q.text),
+          storedLanguage === "vi" ? "vi-VN" : "en-US"
+        );
       } catch (e) {
         console.error("Error parsing questions:", e);
       }
@@ -96,26 +122,44 @@ export default function LiveDemoPage() {
 
   useEffect(() => {
     if (questions.length > 0 && currentQuestion) {
-      setTimeout(() => speakQuestion(currentQuestion.text), 500);
+      setTimeout(
+        () => speakQuestion(currentQuestion.text, currentQuestionIndex),
+        500
+      );
     }
   }, [currentQuestionIndex, questions]);
 
-  const speakQuestion = async (text: string) => {
-    setIsSpeaking(true);
+  const fetchQuestionAudio = async (text: string, index?: number) => {
+    // Prefetched audio from the interview session, if there is one
+    const sessionId = sessionRef.current ? await sessionRef.current : null;
+    if (sessionId && index !== undefined) {
+      const res = await fetch(
+        apiUrl(`/api/interview/sessions/${sessionId}/questions/${index}/audio`)
+      );
+      if (res.ok) {
+        return res.json();
+      }
+    }
 
-    try {
-      const langParam = language === "vi" ? "vi-VN" : "en-US";
-      const res = await fetch(apiUrl("/api/text-to-speech"), {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ text, language: langParam }),
-      });
+    const langParam = language === "vi" ? "vi-VN" : "en-US";
+    const res = await fetch(apiUrl("/api/text-to-speech"), {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ text, language: langParam }),
+    });
 
-      if (!res.ok) {
-        throw new Error("Failed to synthesize speech");
-      }
+    if (!res.ok) {
+      throw new Error("Failed to synthesize speech");
+    }
 
-      const data = await res.json();
+    return res.json();
+  };
+
+  const speakQuestion = async (text: string, index?: number) => {
+    setIsSpeaking(true);
+
+    try {
+      const data = await fetchQuestionAudio(text, index);
       const audio = new Audio(`data:audio/mp3;base64,${data.audio}`);
 
       audio.onended = () => setIsSpeaking(false);
@@ -501,7 +545,8 @@ export default function LiveDemoPage() {
                 </span>
                 <button
                   onClick={() =>
-                    currentQuestion && speakQuestion(currentQuestion.text)
+                    currentQuestion &&
+                    speakQuestion(currentQuestion.text, currentQuestionIndex)
                   }
                   disabled={isSpeaking}
                   className={`btn btn-sm btn-circle ${